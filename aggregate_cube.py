@@ -0,0 +1,234 @@
+import copy
+from typing import Optional
+import numpy as np
+from token_index import TokenIndex
+
+
+class AggregateCube:
+    """
+    Precomputed counts and sums of numeric attributes per token of the categorical columns.
+
+    For every categorical column the cube holds the count of rows and the sum of every attribute per token. For
+    every pair of different columns it also holds them per token of the first column and per top token of the
+    second one, so the dashboard means and top token selections are read from small arrays. Means over a selection
+    of rows are aggregated on demand from the token indexes and the attribute arrays, without copying the data.
+    """
+
+    TOP_TOKENS = 5
+
+    def __init__(self, token_indexes: dict[str, TokenIndex], attributes: dict[str, np.ndarray],
+                 top_tokens: int = TOP_TOKENS) -> None:
+        """
+        Initializes the AggregateCube instance.
+
+        :param token_indexes: Dictionary mapping categorical columns to their TokenIndex.
+        :param attributes: Dictionary mapping numeric attributes to their values, aligned with the indexed rows.
+        :param top_tokens: Number of most frequent tokens kept per column.
+        """
+        self.token_indexes = token_indexes
+        self.attributes = list(attributes)
+        self.attribute_values = attributes
+        self.top_tokens = top_tokens
+        values = self.stack_values(attributes)
+        self.top = {column: self.most_frequent(index.counts, top_tokens) for column, index in token_indexes.items()}
+        self.counts = {}
+        self.sums = {}
+        for left, left_index in token_indexes.items():
+            rows = np.arange(len(left_index.row_offsets) - 1)
+            self.counts[left, None], self.sums[left, None] = self.aggregate(left_index, rows, values)
+            for group, group_index in token_indexes.items():
+                if group == left:
+                    continue
+                parts = [self.aggregate(left_index, group_index.rows(group_index.vocabulary[token]), values)
+                         for token in self.top[group]]
+                self.counts[left, group], self.sums[left, group] = self.stack_groups(
+                    parts, self.counts[left, None], self.sums[left, None])
+
+    @staticmethod
+    def stack_values(attributes: dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Stacks the attribute values into one array.
+
+        :param attributes: Dictionary mapping numeric attributes to their values.
+        :return: Array of shape (attributes, rows) of float64 values.
+        """
+        return np.vstack([np.asarray(column, dtype=np.float64) for column in attributes.values()])
+
+    @staticmethod
+    def stack_groups(parts: list[tuple[np.ndarray, np.ndarray]], counts: np.ndarray,
+                     sums: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Stacks the aggregates per group token along a last axis, which is empty when there are no group tokens.
+
+        :param parts: List of the counts and sums per token of every group token.
+        :param counts: Counts per token without group, giving the shape and type of the stacked counts.
+        :param sums: Sums per token without group, giving the shape and type of the stacked sums.
+        :return: Tuple of the counts and sums with one entry per group token on the last axis.
+        """
+        if not parts:
+            return np.zeros(counts.shape + (0,), dtype=counts.dtype), np.zeros(sums.shape + (0,), dtype=sums.dtype)
+        return (np.stack([part_counts for part_counts, _ in parts], axis=-1),
+                np.stack([part_sums for _, part_sums in parts], axis=-1))
+
+    @staticmethod
+    def pad_tokens(array: np.ndarray, size: int, axis: int) -> np.ndarray:
+        """
+        Pads an array of aggregates with zeros for tokens added to a vocabulary.
+
+        :param array: Array of aggregates per token.
+        :param size: New size of the vocabulary.
+        :param axis: Axis of the tokens.
+        :return: Array whose token axis has the given size.
+        """
+        padding = [(0, 0)] * array.ndim
+        padding[axis] = (0, size - array.shape[axis])
+        return np.pad(array, padding)
+
+    def updated(self, token_indexes: dict[str, TokenIndex], attributes: dict[str, np.ndarray], removed: np.ndarray,
+                added: np.ndarray) -> 'AggregateCube':
+        """
+        Builds the cube of updated data from this cube, aggregating only the removed and added rows.
+
+        The token indexes must keep the token ids of the current ones, as ``TokenIndex.updated`` does. The
+        aggregates per top group token are adjusted when the token stays in the top tokens and aggregated again
+        otherwise.
+
+        :param token_indexes: Dictionary mapping categorical columns to their TokenIndex over the updated rows.
+        :param attributes: Dictionary mapping numeric attributes to their updated values.
+        :param removed: Array of the positions of the removed rows in the current data.
+        :param added: Array of the positions of the added rows in the updated data.
+        :return: AggregateCube over the updated data.
+        """
+        cube = copy.copy(self)
+        cube.token_indexes = token_indexes
+        cube.attribute_values = attributes
+        cube.top = {column: self.most_frequent(index.counts, self.top_tokens)
+                    for column, index in token_indexes.items()}
+        cube.counts = {}
+        cube.sums = {}
+        old_values, new_values = self.stack_values(self.attribute_values), self.stack_values(attributes)
+
+        def change(left: str, old_rows: np.ndarray, new_rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            size = len(token_indexes[left].vocabulary)
+            old_counts, old_sums = self.aggregate(self.token_indexes[left], old_rows, old_values)
+            new_counts, new_sums = self.aggregate(token_indexes[left], new_rows, new_values)
+            return (new_counts - self.pad_tokens(old_counts, size, 0),
+                    new_sums - self.pad_tokens(old_sums, size, 1))
+
+        group_rows = {}
+        for group, index in token_indexes.items():
+            old_tokens, old_owners = self.token_indexes[group].row_tokens_of(removed)
+            new_tokens, new_owners = index.row_tokens_of(added)
+            group_rows[group] = {token: (removed[old_owners[old_tokens == token]],
+                                         added[new_owners[new_tokens == token]])
+                                 for token in cube.top[group].tolist()}
+
+        for left, left_index in token_indexes.items():
+            size = len(left_index.vocabulary)
+            counts, sums = change(left, removed, added)
+            cube.counts[left, None] = self.pad_tokens(self.counts[left, None], size, 0) + counts
+            cube.sums[left, None] = self.pad_tokens(self.sums[left, None], size, 1) + sums
+            for group, group_index in token_indexes.items():
+                if group == left:
+                    continue
+                old_top = self.top[group].tolist()
+                parts = []
+                for token in cube.top[group].tolist():
+                    if token in old_top:
+                        position = old_top.index(token)
+                        counts, sums = change(left, *group_rows[group][token])
+                        parts.append((self.pad_tokens(self.counts[left, group][:, position], size, 0) + counts,
+                                      self.pad_tokens(self.sums[left, group][:, :, position], size, 1) + sums))
+                    else:
+                        parts.append(self.aggregate(left_index, group_index.rows(group_index.vocabulary[token]),
+                                                    new_values))
+                cube.counts[left, group], cube.sums[left, group] = self.stack_groups(
+                    parts, cube.counts[left, None], cube.sums[left, None])
+        return cube
+
+    @staticmethod
+    def most_frequent(counts: np.ndarray, limit: int) -> np.ndarray:
+        """
+        Finds the most frequent tokens, breaking ties by token id.
+
+        :param counts: Number of rows of every token.
+        :param limit: Maximum number of tokens.
+        :return: Token ids in decreasing order of count.
+        """
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return order[counts[order] > 0]
+
+    @staticmethod
+    def aggregate(index: TokenIndex, rows: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Counts the given rows and sums their attributes per token of a column.
+
+        :param index: TokenIndex of the column.
+        :param rows: Array of row positions.
+        :param values: Array of shape (attributes, rows) with the attribute values of every row.
+        :return: Tuple of the count per token and the array of shape (attributes, tokens) of sums per token.
+        """
+        tokens, owners = index.row_tokens_of(rows)
+        size = len(index.vocabulary)
+        counts = np.bincount(tokens, minlength=size)
+        token_values = values[:, rows[owners]]
+        sums = np.stack([np.bincount(tokens, weights=attribute, minlength=size) for attribute in token_values])
+        return counts, sums
+
+    def aggregate_selection(self, rows: np.ndarray, left: str, attribute: str,
+                            group: Optional[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Counts a selection of rows and sums one attribute per token of a column, optionally per top token of the
+        selection in a group column.
+
+        :param rows: Array of row positions.
+        :param left: The categorical column to aggregate.
+        :param attribute: The numeric attribute to sum.
+        :param group: The categorical column splitting the aggregates, or None.
+        :return: Tuple of the top left tokens, the top group tokens (None without group), the counts and the sums
+                 per left token (and per top group token).
+        """
+        left_index = self.token_indexes[left]
+        values = np.asarray(self.attribute_values[attribute])[np.newaxis]
+        counts, sums = self.aggregate(left_index, rows, values)
+        left_tokens = self.most_frequent(counts, self.top_tokens)
+        if group is None:
+            return left_tokens, None, counts, sums[0]
+
+        group_index = self.token_indexes[group]
+        tokens, owners = group_index.row_tokens_of(rows)
+        group_tokens = self.most_frequent(np.bincount(tokens, minlength=len(group_index.vocabulary)),
+                                          self.top_tokens)
+        parts = [self.aggregate(left_index, rows[owners[tokens == token]], values) for token in group_tokens]
+        group_counts, group_sums = self.stack_groups(parts, counts, sums)
+        return left_tokens, group_tokens, group_counts, group_sums[0]
+
+    def means(self, left: str, attribute: str, group: Optional[str] = None,
+              rows: Optional[np.ndarray] = None) -> tuple[list, list, np.ndarray]:
+        """
+        Computes the mean of an attribute for the top tokens of a column, optionally split by the top tokens of a
+        group column.
+
+        :param left: The categorical column whose top tokens are the bars.
+        :param attribute: The numeric attribute to average.
+        :param group: The categorical column splitting each bar, or None.
+        :param rows: Array of the row positions to aggregate, or None for every row.
+        :return: Tuple of the left tokens, the group tokens (the attribute name without group) and the array of
+                 means of shape (left tokens, group tokens), NaN where no row has both tokens.
+        """
+        if group == left:
+            group = None
+        if rows is None:
+            left_tokens, group_tokens = self.top[left], self.top.get(group)
+            counts = self.counts[left, group]
+            sums = self.sums[left, group][self.attributes.index(attribute)]
+        else:
+            left_tokens, group_tokens, counts, sums = self.aggregate_selection(rows, left, attribute, group)
+        counts, sums = counts[left_tokens], sums[left_tokens]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / counts, np.nan)
+        left_labels = [self.token_indexes[left].vocabulary[token] for token in left_tokens]
+        if group is None:
+            return left_labels, [attribute], means.reshape(-1, 1)
+        group_labels = [self.token_indexes[group].vocabulary[token] for token in group_tokens]
+        return left_labels, group_labels, means
@@ -0,0 +1,78 @@
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+class AttributeStatistics:
+    """
+    Descriptive statistics of the numeric attributes, the same as ``Series.describe``.
+
+    The quantiles are read from the ascending orders of the attributes kept for sorting, so no attribute is sorted
+    again. The statistics of all rows are computed for every attribute at once and kept, those of a selection of
+    rows walk the order of the attribute to collect the selected values already sorted.
+    """
+
+    PERCENTILES = np.array([0.25, 0.5, 0.75])
+    LABELS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+    def __init__(self, attributes: dict[str, np.ndarray], sort_orders: dict[str, np.ndarray]) -> None:
+        """
+        Initializes the AttributeStatistics instance.
+
+        :param attributes: Dictionary mapping numeric attributes to their values.
+        :param sort_orders: Dictionary mapping the attributes to the stable ascending order of their rows.
+        """
+        self.attribute_values = attributes
+        self.sort_orders = sort_orders
+        sorted_values = np.vstack([np.asarray(values, dtype=np.float64)[sort_orders[attribute]]
+                                   for attribute, values in attributes.items()])
+        self.summary = {attribute: pd.Series(row, index=self.LABELS, name=attribute)
+                        for attribute, row in zip(attributes, self.summarize(sorted_values))}
+
+    @classmethod
+    def summarize(cls, sorted_values: np.ndarray) -> np.ndarray:
+        """
+        Computes the descriptive statistics of sorted values.
+
+        Quantiles are interpolated linearly between the closest ranks, as pandas does.
+
+        :param sorted_values: Array of shape (attributes, rows) of values sorted in ascending order, NaN last.
+        :return: Array of shape (attributes, 8) of the statistics in the order of LABELS, NaN where undefined.
+        """
+        counts = np.count_nonzero(~np.isnan(sorted_values), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            totals = np.nansum(sorted_values, axis=1)
+            means = totals / counts
+            deviations = np.where(np.isnan(sorted_values), 0, sorted_values - means[:, np.newaxis])
+            stds = np.sqrt(np.einsum("ij,ij->i", deviations, deviations) / (counts - 1))
+        positions = np.outer(np.maximum(counts - 1, 0), cls.PERCENTILES)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, np.maximum(counts - 1, 0)[:, np.newaxis])
+        if sorted_values.shape[1] == 0:
+            quantiles = np.full(positions.shape, np.nan)
+            minimums = maximums = np.full(len(counts), np.nan)
+        else:
+            lower_values = np.take_along_axis(sorted_values, lower, axis=1)
+            upper_values = np.take_along_axis(sorted_values, upper, axis=1)
+            quantiles = lower_values + (upper_values - lower_values) * (positions - lower)
+            minimums = sorted_values[:, 0]
+            maximums = np.take_along_axis(sorted_values, np.maximum(counts - 1, 0)[:, np.newaxis], axis=1)[:, 0]
+        summary = np.column_stack([counts, means, stds, minimums, quantiles, maximums])
+        summary[counts == 0, 1:] = np.nan
+        return summary
+
+    def describe(self, attribute: str, rows: Optional[np.ndarray] = None) -> pd.Series:
+        """
+        Retrieves the descriptive statistics of an attribute.
+
+        :param attribute: The numeric attribute.
+        :param rows: Array of the row positions to describe, or None for every row.
+        :return: Series of the statistics indexed by LABELS.
+        """
+        if rows is None:
+            return self.summary[attribute]
+        order = self.sort_orders[attribute]
+        selected = np.zeros(len(order), dtype=bool)
+        selected[rows] = True
+        sorted_values = np.asarray(self.attribute_values[attribute], dtype=np.float64)[order[selected[order]]]
+        return pd.Series(self.summarize(sorted_values[np.newaxis])[0], index=self.LABELS, name=attribute)
@@ -0,0 +1,275 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+
+class Benchmark:
+    """
+    Times the loading, search and graph data preparation of SteamLens on synthetic data of several sizes.
+
+    Every size is measured in a fresh interpreter, since the DataLoader is a singleton and the peak memory of one
+    size should not carry over to the next. The synthetic files are generated once per size and seed and reused by
+    later runs. Results are written as JSON, keyed by size and benchmark name, and can be compared with those of an
+    earlier run.
+    """
+
+    SIZES = [10_000, 100_000, 1_000_000, 5_000_000]
+    SEARCHES = {
+        "all": ("", "None", "None", "None", 0, 0, 0),
+        "text": ("dragon", "None", "None", "None", 0, 0, 0),
+        "text_words": ("dark quest", "None", "None", "None", 0, 0, 0),
+        "category": ("", "Single-player", "None", "None", 0, 0, 0),
+        "genre": ("", "None", "Action", "None", 0, 0, 0),
+        "tag": ("", "None", "None", "Indie", 0, 0, 0),
+        "platform": ("", "None", "None", "None", 0, 1, 1),
+        "tokens": ("", "Single-player", "Action", "Indie", 0, 0, 0),
+        "combined": ("dragon", "Single-player", "Action", "Indie", 1, 0, 0),
+    }
+
+    def __init__(self, sizes: list[int], seed: int = 0, repeat: int = 3, data_dir: str = "benchmark_data") -> None:
+        """
+        Initializes the Benchmark instance.
+
+        :param sizes: Numbers of games to benchmark.
+        :param seed: Seed of the synthetic data.
+        :param repeat: Number of runs of every benchmark, all of them are reported.
+        :param data_dir: Directory holding the synthetic data files.
+        """
+        self.sizes = sizes
+        self.seed = seed
+        self.repeat = repeat
+        self.data_dir = data_dir
+
+    def data_file(self, rows: int) -> str:
+        """
+        Retrieves the synthetic data file of a size, generating it if it does not exist yet.
+
+        :param rows: Number of games.
+        :return: Path to the CSV file.
+        """
+        from synthetic_data import SyntheticGames
+
+        path = os.path.join(self.data_dir, f"games_{rows}_{self.seed}.csv")
+        if not os.path.exists(path):
+            os.makedirs(self.data_dir, exist_ok=True)
+            print(f"Generating {path}")
+            SyntheticGames(rows, self.seed).write(path + ".tmp")
+            os.replace(path + ".tmp", path)
+        return path
+
+    def measure_size(self, rows: int) -> dict:
+        """
+        Runs the benchmarks of one size in a fresh interpreter.
+
+        :param rows: Number of games.
+        :return: Dictionary of the peak memory, the memory of the data and the run times of every benchmark.
+        """
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", self.data_file(rows),
+                                 "--repeat", str(self.repeat)], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"benchmark of {rows} rows failed:\n{result.stderr.strip()}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    @staticmethod
+    def timings(function, repeat: int, setup=None) -> list[float]:
+        """
+        Times a function.
+
+        :param function: Function called without arguments.
+        :param repeat: Number of runs.
+        :param setup: Function called without arguments before every run and not timed, or None.
+        :return: List of the run times in seconds.
+        """
+        runs = []
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            function()
+            runs.append(time.perf_counter() - start)
+        return runs
+
+    @classmethod
+    def measure(cls, data_file: str, repeat: int) -> dict:
+        """
+        Runs every benchmark on a data file in the current interpreter.
+
+        :param data_file: Path to the CSV file.
+        :param repeat: Number of runs of every benchmark.
+        :return: Dictionary of the peak memory, the memory of the data and the run times of every benchmark.
+        """
+        import tempfile
+        import pandas as pd
+        from data_loader import DataLoader
+        from graph_controller import GraphController
+        from search_controller import SearchController
+        from snapshot_cache import SnapshotCache
+
+        runs = {}
+        start = time.perf_counter()
+        loader = DataLoader(data_file, use_snapshot=False)
+        runs["startup"] = [time.perf_counter() - start]
+        # The memory of the data read without the column schema is summed chunk by chunk, so it does not raise the
+        # peak memory.
+        data_memory = {"typed": loader.memory_usage.sum() / 2 ** 20,
+                       "untyped": sum(chunk.memory_usage(deep=True).sum()
+                                      for chunk in pd.read_csv(data_file, chunksize=loader.CSV_CHUNK_SIZE)) / 2 ** 20}
+        runs["load_data"] = cls.timings(lambda: loader.load_data(data_file), repeat)
+
+        def preprocess() -> float:
+            elapsed = 0.0
+            for chunk in pd.read_csv(data_file, dtype=loader.COLUMN_TYPES, chunksize=loader.CSV_CHUNK_SIZE,
+                                     usecols=lambda column: column not in loader.DROPPED_COLUMNS):
+                chunk_start = time.perf_counter()
+                loader.preprocess_data(chunk)
+                elapsed += time.perf_counter() - chunk_start
+            return elapsed
+
+        # Only the preprocessing of the chunks is timed, not their parsing.
+        runs["preprocess_data"] = [preprocess() for _ in range(repeat)]
+
+        for build in ["build_sort_orders", "build_statistics", "build_token_indexes", "build_release_timeline",
+                      "build_text_indexes", "build_aggregates"]:
+            runs[build] = cls.timings(getattr(loader, build), repeat)
+
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            snapshot = SnapshotCache(data_file, snapshot_dir)
+            runs["snapshot.save"] = cls.timings(lambda: snapshot.save(loader.data), repeat)
+            runs["snapshot.load"] = cls.timings(snapshot.load, repeat)
+
+        search_controller = SearchController()
+        for name, arguments in cls.SEARCHES.items():
+            runs[f"search_data.{name}"] = cls.timings(lambda: search_controller.search_data(*arguments), repeat)
+        all_rows = search_controller.search_rows(*cls.SEARCHES["all"])
+        runs["top_rows"] = cls.timings(lambda: search_controller.top_rows(all_rows, "Positive", True, 100), repeat)
+
+        graph_controller = GraphController()
+        selected_games = search_controller.search_rows(*cls.SEARCHES["genre"])
+        graphs = {
+            "price_dist_data": graph_controller.price_dist_data,
+            "released_year_data": graph_controller.released_year_data,
+            "relationship_data": lambda: graph_controller.relationship_data("Price", "User score"),
+            "relationship_density_data": lambda: graph_controller.relationship_density_data("Price", "User score"),
+            "dashboard_data": lambda: graph_controller.dashboard_data("Genres", "Price", "None"),
+            "dashboard_data.grouped": lambda: graph_controller.dashboard_data("Genres", "Positive", "Platform"),
+            "get_descriptive_statistics": lambda: graph_controller.get_descriptive_statistics("Price"),
+        }
+        for name, function in graphs.items():
+            runs[f"graph.{name}"] = cls.timings(function, repeat, GraphController.cache.clear)
+        graph_controller.selected_games = selected_games
+        for name in ["dashboard_data", "dashboard_data.grouped", "get_descriptive_statistics"]:
+            runs[f"graph.{name}.selected"] = cls.timings(graphs[name], repeat, GraphController.cache.clear)
+
+        peak_memory = None
+        try:
+            import resource
+            peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin"
+                                                                                 else 1024) / 2 ** 20
+        except ImportError:
+            pass
+        return {"rows": len(loader.data), "peak_memory_mb": peak_memory, "data_memory_mb": data_memory, "runs": runs}
+
+    @staticmethod
+    def environment() -> dict:
+        """
+        Describes the interpreter and libraries the benchmark runs with.
+
+        :return: Dictionary of the versions and machine.
+        """
+        import matplotlib
+        import numpy as np
+        import pandas as pd
+
+        return {"python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+                "matplotlib": matplotlib.__version__, "machine": platform.machine(), "system": platform.system(),
+                "cpus": os.cpu_count()}
+
+    @staticmethod
+    def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+        """
+        Prints the change of the best run time of every benchmark against an earlier run.
+
+        :param results: Results of this run.
+        :param baseline: Results of the earlier run.
+        :param tolerance: Allowed relative slowdown, e.g. 0.2 for 20%.
+        :return: True if no benchmark is slower than the baseline by more than the tolerance, False otherwise.
+        """
+        within_tolerance = True
+        for size, measured in results["sizes"].items():
+            baseline_runs = baseline.get("sizes", {}).get(size, {}).get("runs", {})
+            for name, runs in measured["runs"].items():
+                if name not in baseline_runs:
+                    continue
+                before, after = min(baseline_runs[name]), min(runs)
+                ratio = after / before if before else float("inf")
+                slower = ratio > 1 + tolerance and after - before > 1e-3
+                within_tolerance &= not slower
+                print(f"{size:>9} {name:<40} {before * 1000:10.2f} ms -> {after * 1000:10.2f} ms  x{ratio:5.2f}"
+                      f"{'  slower' if slower else ''}")
+        return within_tolerance
+
+    def run(self, output: str, baseline_file: str = None, tolerance: float = 0.2) -> bool:
+        """
+        Benchmarks every size, prints the best run times and writes the results.
+
+        :param output: Path of the JSON results file.
+        :param baseline_file: Path of the JSON results of an earlier run to compare with, or None.
+        :param tolerance: Allowed relative slowdown against the baseline.
+        :return: True if every size was measured and none is slower than the baseline, False otherwise.
+        """
+        results = {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"), "seed": self.seed,
+                   "repeat": self.repeat, "environment": self.environment(), "sizes": {}}
+        for rows in self.sizes:
+            try:
+                measured = self.measure_size(rows)
+            except (RuntimeError, json.JSONDecodeError, IndexError) as error:
+                print(f"Error: {error}")
+                return False
+            results["sizes"][str(rows)] = measured
+            data_memory = measured["data_memory_mb"]
+            print(f"{rows} rows, peak memory {measured['peak_memory_mb'] or 0:.0f} MB,"
+                  f" data {data_memory['typed']:.1f} MB ({data_memory['untyped']:.1f} MB without the column schema)")
+            for name, runs in measured["runs"].items():
+                print(f"  {name:<40} best {min(runs) * 1000:10.2f} ms"
+                      f"  median {statistics.median(runs) * 1000:10.2f} ms")
+
+        with open(output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {output}")
+        if baseline_file is None:
+            return True
+        try:
+            with open(baseline_file) as file:
+                baseline = json.load(file)
+        except (OSError, json.JSONDecodeError) as error:
+            print(f"Error: could not read {baseline_file} ({error}).")
+            return False
+        return self.compare(results, baseline, tolerance)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark SteamLens on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=Benchmark.SIZES,
+                        help="numbers of games (default: 10000 100000 1000000 5000000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic data (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs of every benchmark (default: 3)")
+    parser.add_argument("--data-dir", default="benchmark_data",
+                        help="directory of the synthetic data files (default: benchmark_data)")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="path of the JSON results (default: benchmark_results.json)")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative slowdown against the baseline (default: 0.2)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    if arguments.worker:
+        print(json.dumps(Benchmark.measure(arguments.worker, arguments.repeat)))
+        sys.exit(0)
+    benchmark = Benchmark(arguments.sizes, arguments.seed, arguments.repeat, arguments.data_dir)
+    sys.exit(0 if benchmark.run(arguments.output, arguments.baseline, arguments.tolerance) else 1)
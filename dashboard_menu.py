@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
-from threading import Thread
 from graph_controller import GraphController
+from graph_worker import GraphWorker
 
 
 class DashboardMenu(tk.Frame):
@@ -28,6 +28,7 @@ class DashboardMenu(tk.Frame):
         self.group_by_selected = tk.StringVar()
         self.group_by_selected.set("None")
         self.init_components()
+        self.graph_worker = GraphWorker(self, self.show_loading)
 
     def init_components(self) -> None:
         """
@@ -82,32 +83,31 @@ class DashboardMenu(tk.Frame):
 
     def update_graph(self, *args) -> None:
         """
-        Updates the graph based on user selections.
-        """
-        padding = {'padx': 15, 'pady': 10}
-        if self.graph_widget:
-            self.graph_widget.destroy()
+        Updates the graph in place based on user selections.
 
-        self.update_thread = Thread(target=self.update_graph_async)
-        self.update_thread.start()
-        self.check_update_graph()
-        self.loading_label.pack(**padding)
+        The means are computed on the graph worker and the graph is drawn with them once they are ready.
+        """
+        left_col, right_col = self.column_left_selected.get(), self.column_right_selected.get()
+        group_by_col = self.group_by_selected.get()
+        self.graph_worker.request(
+            lambda: self.graph_controller.dashboard_data(left_col, right_col, group_by_col),
+            lambda data: self.graph_controller.dashboard_graph(self, left_col, right_col, group_by_col, data))
 
-    def check_update_graph(self) -> None:
+    def show_loading(self, busy: bool) -> None:
         """
-        Check if the update thread is still alive.
+        Shows the loading label while the graph is being computed.
+
+        :param busy: Whether a computation is running.
         """
-        if self.update_thread.is_alive():
-            self.after(10, self.check_update_graph)
+        if busy:
+            self.loading_label.pack(before=self.graph_widget, padx=15, pady=10)
         else:
             self.loading_label.pack_forget()
-            self.graph_widget.pack()
 
-    def update_graph_async(self) -> None:
+    def destroy(self) -> None:
         """
-        Updates the graph asynchronously.
+        Releases the graph figure and destroys the menu.
         """
-        self.graph_widget = self.graph_controller.dashboard_graph(self, self.column_left_selected.get(),
-                                                                  self.column_right_selected.get(),
-                                                                  self.group_by_selected.get())
-        self.check_update_graph()
+        self.graph_worker.cancel()
+        self.graph_controller.close_canvas()
+        super().destroy()
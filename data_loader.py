@@ -1,19 +1,67 @@
-import pandas as pd
-from threading import Thread
+import os
+import time
+from collections import defaultdict
+from threading import Event, Lock, Thread
+from typing import TYPE_CHECKING, Optional
+from perf_log import PerfLog
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from aggregate_cube import AggregateCube
+    from attribute_statistics import AttributeStatistics
+    from token_index import TokenIndex
+    from trigram_index import TrigramIndex
 
 
 class DataLoader:
     """
     A singleton class for loading and preprocessing data from a file.
+
+    pandas, numpy and the index modules are imported by the loading methods, so importing this module and
+    starting a background load does not delay the start of the application.
     """
 
     _instance = None
+    DROPPED_COLUMNS = ['Score rank', 'Reviews', 'Metacritic url', 'Notes']
+    COLUMN_TYPES = {
+        'AppID': 'int32', 'Peak CCU': 'int32', 'Required age': 'uint8', 'Price': 'float32', 'DLC count': 'int32',
+        'Windows': 'bool', 'Mac': 'bool', 'Linux': 'bool', 'Metacritic score': 'uint8', 'User score': 'uint8',
+        'Positive': 'int32', 'Negative': 'int32', 'Achievements': 'int32', 'Recommendations': 'int32',
+        'Average playtime forever': 'int32', 'Average playtime two weeks': 'int32',
+        'Median playtime forever': 'int32', 'Median playtime two weeks': 'int32',
+        'Estimated owners': 'category', 'Supported languages': 'category', 'Full audio languages': 'category',
+        'Release date': 'category', 'Developers': 'category', 'Publishers': 'category', 'Categories': 'category',
+        'Genres': 'category', 'Website': 'category', 'Support url': 'category', 'Support email': 'category',
+        'Movies': 'category'
+    }
+    MULTI_VALUED_COLUMNS = ['Categories', 'Genres', 'Tags']
+    CATEGORICAL_COLUMNS = ['Platform'] + MULTI_VALUED_COLUMNS
+    TEXT_SEARCH_COLUMNS = ['Name', 'Developers', 'Publishers']
+    # Columns derived at load for the graphs, left out of data_columns.
+    HIDDEN_COLUMNS = ['Release year', 'Release month']
+    MONTHS = {month: number for number, month in enumerate(["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug",
+                                                             "Sep", "Oct", "Nov", "Dec"], start=1)}
+    LOAD_STAGES = ["data", "statistics", "search", "aggregates"]
+    CSV_CHUNK_SIZE = 50_000
+    CSV_PARTITION_BYTES = 16 * 1024 * 1024
+    CSV_SCAN_BYTES = 4 * 1024 * 1024
+    # Number of processes parsing the partitions of a data file of at least two partitions, 1 to parse in the
+    # loading thread.
+    preprocess_workers = os.cpu_count() or 1
+    DELTA_DELETE_COLUMN = 'Deleted'
+    NULLABLE_TYPES = {'int32': 'Int32', 'uint8': 'UInt8', 'bool': 'boolean'}
+    PLATFORM_LABELS = ["", "Windows", "Mac", "Windows,Mac", "Linux", "Windows,Linux", "Mac,Linux", "Windows,Mac,Linux"]
 
-    def __new__(cls, data_file) -> 'DataLoader':
+    def __new__(cls, data_file, use_snapshot: bool = True, background: bool = False,
+                stages: Optional[list[str]] = None) -> 'DataLoader':
         """
         Creates a singleton instance of the DataLoader class if it doesn't already exist.
 
         :param data_file: Path to the data file.
+        :param use_snapshot: Whether to load from and save to the preprocessed snapshot of the data file.
+        :param background: Whether to return immediately and keep loading in a background thread.
+        :param stages: Loading stages to run, or None to run every stage of LOAD_STAGES.
         :return: DataLoader instance
         """
         if cls._instance is None:
@@ -21,24 +69,54 @@ class DataLoader:
             cls._instance.__initialized = False
         return cls._instance
 
-    def __init__(self, data_file) -> None:
+    def __init__(self, data_file, use_snapshot: bool = True, background: bool = False,
+                 stages: Optional[list[str]] = None) -> None:
         """
         Initializes the DataLoader instance.
 
+        Loading runs in ``data_thread``. Without ``background`` the constructor waits for it, otherwise the
+        readiness of each stage of LOAD_STAGES can be polled with ``is_ready``, awaited with
+        ``wait_until_ready`` or observed with ``add_ready_callback``. Stages left out of ``stages`` are never ready,
+        except that the data stage always runs and the aggregates stage runs the statistics stage it depends on.
+
         :param data_file: Path to the data file.
+        :param use_snapshot: Whether to load from and save to the preprocessed snapshot of the data file.
+        :param background: Whether to return immediately and keep loading in a background thread.
+        :param stages: Loading stages to run, or None to run every stage of LOAD_STAGES.
         """
         if self.__initialized:
             return
         self.__initialized = True
-        self.data_thread = Thread(target=lambda: self.load_data(data_file))
-        self.data_thread.start()
-        self.data_thread.join()
-        self.data_categories = self.__data["Categories"].copy().str.split(",").explode('Categories').unique()
-        self.data_genres = self.__data["Genres"].copy().str.split(",").explode('Genres').unique()
-        self.data_tags = self.__data["Tags"].copy().str.split(",").explode('Tags').unique()
+        self.__data = None
+        self.__token_indexes = None
+        self.__text_indexes = None
+        self.__sort_orders = None
+        self.__statistics = None
+        self.__release_timeline = None
+        self.__aggregates = None
         self.__sorting_attributes = ["None", "Price", "Metacritic score", "User score",
                                      "Positive", "Negative", "Recommendations"]
-        self.preprocess_data()
+        self.__ready = {stage: Event() for stage in self.LOAD_STAGES}
+        self.__ready_callbacks = {stage: [] for stage in self.LOAD_STAGES}
+        self.__progress_callbacks = []
+        self.__lock = Lock()
+        self.phase = "Starting"
+        self.rows_parsed = 0
+        self.error = None
+        self.use_snapshot = use_snapshot
+        stages = {"data"} | set(self.LOAD_STAGES if stages is None else stages)
+        if "aggregates" in stages:
+            stages.add("statistics")
+        self.stages = [stage for stage in self.LOAD_STAGES if stage in stages]
+        self.snapshot = None
+        # Incremented whenever the rows change after loading, so results keyed by row positions can be told apart.
+        self.data_version = 0
+        self.data_thread = Thread(target=lambda: self.run_loading(data_file), daemon=True)
+        self.data_thread.start()
+        if not background:
+            self.data_thread.join()
+            if self.error is not None:
+                raise self.error
 
     @classmethod
     def get_instance(cls) -> 'DataLoader':
@@ -49,8 +127,115 @@ class DataLoader:
         """
         return cls._instance
 
+    def is_ready(self, stage: str) -> bool:
+        """
+        Checks whether a loading stage has finished.
+
+        :param stage: One of LOAD_STAGES.
+        :return: True if the stage is ready, False otherwise.
+        """
+        return self.__ready[stage].is_set()
+
+    def wait_until_ready(self, stage: str = LOAD_STAGES[-1], timeout=None) -> bool:
+        """
+        Blocks until a loading stage has finished.
+
+        :param stage: One of LOAD_STAGES, by default the last one.
+        :param timeout: Maximum number of seconds to wait, or None to wait without limit.
+        :return: True if the stage is ready, False if the timeout expired or loading failed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.__ready[stage].wait(0.05):
+            if not self.data_thread.is_alive() or deadline is not None and time.monotonic() >= deadline:
+                return self.__ready[stage].is_set()
+        return True
+
+    def add_ready_callback(self, stage: str, callback) -> None:
+        """
+        Registers a function called once a loading stage has finished.
+
+        The function is called immediately if the stage is already ready, otherwise from the loading thread,
+        so Tkinter code should only use it to hand work over to the Tk thread.
+
+        :param stage: One of LOAD_STAGES.
+        :param callback: Function called without arguments.
+        """
+        with self.__lock:
+            if not self.__ready[stage].is_set():
+                self.__ready_callbacks[stage].append(callback)
+                return
+        callback()
+
+    def add_progress_callback(self, callback) -> None:
+        """
+        Registers a function called from the loading thread whenever the loading phase or row count changes.
+
+        :param callback: Function called with the phase description and the number of rows parsed so far.
+        """
+        with self.__lock:
+            self.__progress_callbacks.append(callback)
+
+    def report_progress(self, phase: str, rows_parsed=None) -> None:
+        """
+        Updates the loading progress and notifies the progress callbacks.
+
+        :param phase: Description of the current loading phase.
+        :param rows_parsed: Number of rows parsed so far, or None to keep the current count.
+        """
+        self.phase = phase
+        if rows_parsed is not None:
+            self.rows_parsed = rows_parsed
+        with self.__lock:
+            callbacks = list(self.__progress_callbacks)
+        for callback in callbacks:
+            callback(self.phase, self.rows_parsed)
+
+    def mark_ready(self, stage: str) -> None:
+        """
+        Marks a loading stage as finished and runs its ready callbacks.
+
+        :param stage: One of LOAD_STAGES.
+        """
+        with self.__lock:
+            self.__ready[stage].set()
+            callbacks, self.__ready_callbacks[stage] = self.__ready_callbacks[stage], []
+        for callback in callbacks:
+            callback()
+
+    def run_loading(self, data_file: str) -> None:
+        """
+        Loads the data and builds the derived structures of the stages to run, marking each stage ready as soon as it
+        is done.
+
+        :param data_file: Path to the data file.
+        """
+        try:
+            self.load_data(data_file)
+            self.mark_ready("data")
+            if "statistics" in self.stages:
+                self.report_progress("Computing statistics")
+                self.build_sort_orders()
+                self.build_statistics()
+                if self.__token_indexes is None:
+                    self.build_token_indexes()
+                self.build_release_timeline()
+                self.mark_ready("statistics")
+            if "search" in self.stages:
+                self.report_progress("Building search indexes")
+                self.build_text_indexes()
+                self.mark_ready("search")
+            if "aggregates" in self.stages:
+                self.report_progress("Building aggregates")
+                self.build_aggregates()
+                self.mark_ready("aggregates")
+            self.report_progress("Ready")
+        except Exception as error:
+            print(f"Error: could not load {data_file} ({error!r}).")
+            self.error = error
+            self.report_progress(f"Error: {error}")
+
     @property
-    def data(self) -> pd.DataFrame:
+    def data(self) -> 'pd.DataFrame':
         """
         Retrieves the loaded data.
 
@@ -61,11 +246,65 @@ class DataLoader:
     @property
     def data_columns(self) -> list[str]:
         """
-        Retrieves the columns of the loaded data.
+        Retrieves the columns of the loaded data, without the hidden columns.
 
         :return: List of column names.
         """
-        return self.data.columns.to_list()
+        return [column for column in self.data.columns if column not in self.HIDDEN_COLUMNS]
+
+    @property
+    def token_indexes(self) -> dict[str, 'TokenIndex']:
+        """
+        Retrieves the token indexes of the categorical columns.
+
+        :return: Dictionary mapping column names to their TokenIndex.
+        """
+        return self.__token_indexes
+
+    @property
+    def text_indexes(self) -> dict[str, 'TrigramIndex']:
+        """
+        Retrieves the trigram indexes of the searchable text columns.
+
+        :return: Dictionary mapping column names to their TrigramIndex.
+        """
+        return self.__text_indexes
+
+    @property
+    def sort_orders(self) -> dict[str, 'np.ndarray']:
+        """
+        Retrieves the ascending order of the rows for every sorting attribute.
+
+        :return: Dictionary mapping sorting attributes to int32 arrays of row positions.
+        """
+        return self.__sort_orders
+
+    @property
+    def statistics(self) -> 'AttributeStatistics':
+        """
+        Retrieves the descriptive statistics of the sorting attributes.
+
+        :return: AttributeStatistics over the loaded data.
+        """
+        return self.__statistics
+
+    @property
+    def release_timeline(self) -> 'pd.DataFrame':
+        """
+        Retrieves the number of games released each year per genre.
+
+        :return: DataFrame indexed by every year from the first to the last release, with one column per genre.
+        """
+        return self.__release_timeline
+
+    @property
+    def aggregates(self) -> 'AggregateCube':
+        """
+        Retrieves the precomputed counts and sums of the numeric attributes per categorical token.
+
+        :return: AggregateCube over the categorical columns and sorting attributes.
+        """
+        return self.__aggregates
 
     @property
     def unique_categories(self) -> list[str]:
@@ -74,7 +313,7 @@ class DataLoader:
 
         :return: List of unique category names.
         """
-        return ["None"] + list(self.data_categories)
+        return ["None"] + self.token_indexes["Categories"].used_tokens()
 
     @property
     def unique_genres(self) -> list[str]:
@@ -83,7 +322,7 @@ class DataLoader:
 
         :return: List of unique genre names.
         """
-        return ["None"] + list(self.data_genres)
+        return ["None"] + self.token_indexes["Genres"].used_tokens()
 
     @property
     def unique_tags(self) -> list[str]:
@@ -92,7 +331,25 @@ class DataLoader:
 
         :return: List of unique tag names.
         """
-        return ["None"] + list(self.data_tags)
+        return ["None"] + self.token_indexes["Tags"].used_tokens()
+
+    @property
+    def memory_usage(self) -> 'pd.Series':
+        """
+        Retrieves the resident memory used by each column of the loaded data.
+
+        :return: Series containing the memory usage in bytes, including the index.
+        """
+        return self.data.memory_usage(deep=True)
+
+    @property
+    def platform_mask(self) -> 'np.ndarray':
+        """
+        Retrieves the platform bitmask of every game, aligned with the rows of the loaded data.
+
+        :return: Array of uint8 bitmasks as encoded by ``platform_bits``.
+        """
+        return self.data["Platform"].cat.codes.to_numpy().view("uint8")
 
     @property
     def sorting_attributes(self) -> list[str]:
@@ -103,47 +360,461 @@ class DataLoader:
         """
         return self.__sorting_attributes
 
+    @PerfLog.timed()
     def load_data(self, data_file: str) -> None:
         """
         Loads data from the specified file.
 
+        A valid snapshot of the preprocessed data is used when available, otherwise the file is parsed and
+        preprocessed in chunks and written to a new snapshot.
+
         :param data_file: Path to the data file.
         """
+        import pandas as pd
+        from snapshot_cache import SnapshotCache
+
+        if self.use_snapshot:
+            self.snapshot = SnapshotCache(data_file)
+            self.report_progress("Reading snapshot")
+            snapshot_data = self.snapshot.load()
+            if snapshot_data is not None:
+                self.__data = snapshot_data
+                self.report_progress("Snapshot loaded", len(snapshot_data))
+                PerfLog.annotate(rows=len(snapshot_data), source="snapshot")
+                return
         try:
             if data_file[-3:] == "csv":
-                self.__data = pd.read_csv(data_file)
+                self.__data = self.read_csv(data_file)
             else:
                 self.__data = pd.DataFrame()
+                return
         except FileNotFoundError:
             print(f"Error: {data_file} not found.")
             self.__data = pd.DataFrame()
+            return
+        PerfLog.annotate(rows=len(self.__data), source="csv")
+        if self.snapshot is not None:
+            self.report_progress("Writing snapshot")
+            self.snapshot.save(self.__data)
+
+    def read_csv(self, data_file: str) -> 'pd.DataFrame':
+        """
+        Parses and preprocesses a CSV data file in chunks of at most CSV_CHUNK_SIZE rows, reporting the number of
+        rows parsed.
+
+        Every chunk is pruned, preprocessed and token indexed as soon as it is read, see ``parse_chunks``, and only
+        copies of its columns are kept, so no column holds on to the memory of a whole chunk. The columns are then
+        concatenated one at a time, releasing the chunk pieces as they are merged, so the peak memory stays close to
+        the size of the final data. The chunk token indexes are joined into the token indexes of the data.
+
+        :param data_file: Path to the data file.
+        :return: DataFrame containing the preprocessed data.
+        """
+        import pandas as pd
+        from pandas.api.types import union_categoricals
+        from token_index import TokenIndex
+
+        pieces = {}
+        chunk_indexes = {column: [] for column in self.CATEGORICAL_COLUMNS}
+        rows_parsed = 0
+        self.report_progress(f"Parsing {os.path.basename(data_file)}", rows_parsed)
+        for chunk_rows, chunk_columns, token_indexes in self.parse_chunks(data_file):
+            rows_parsed += chunk_rows
+            for column, values in chunk_columns.items():
+                pieces.setdefault(column, []).append(values)
+            for column, token_index in token_indexes.items():
+                chunk_indexes[column].append(token_index)
+            del chunk_columns, token_indexes
+            self.report_progress(f"Parsing {os.path.basename(data_file)}", rows_parsed)
+        if not pieces:
+            return self.preprocess_data(pd.read_csv(data_file, dtype=self.COLUMN_TYPES,
+                                                    usecols=lambda column: column not in self.DROPPED_COLUMNS))
+
+        self.report_progress("Merging chunks")
+        first_pieces = next(iter(pieces.values()))
+        index = first_pieces[0].index.append([piece.index for piece in first_pieces[1:]])
+        columns = {}
+        for column in list(pieces):
+            column_pieces = pieces.pop(column)
+            if isinstance(column_pieces[0].dtype, pd.CategoricalDtype):
+                columns[column] = union_categoricals(column_pieces)
+            else:
+                columns[column] = pd.concat(column_pieces, ignore_index=True).array
+            del column_pieces
+        self.__token_indexes = {column: TokenIndex.concatenate(indexes) for column, indexes in chunk_indexes.items()}
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def parse_chunks(self, data_file: str):
+        """
+        Parses, preprocesses and token indexes the chunks of a CSV data file, in row order.
+
+        A file of at least two partitions of CSV_PARTITION_BYTES is split at row boundaries and its partitions are
+        parsed by a pool of preprocess_workers processes, otherwise the file is parsed in the calling thread.
+
+        :param data_file: Path to the data file.
+        :return: Generator of the chunks, see ``index_chunk``.
+        """
+        import pandas as pd
+
+        partitions = []
+        if self.preprocess_workers > 1 and os.path.getsize(data_file) >= 2 * self.CSV_PARTITION_BYTES:
+            header_end, partitions = self.csv_partitions(data_file)
+        if len(partitions) < 2:
+            for chunk in pd.read_csv(data_file, dtype=self.COLUMN_TYPES, chunksize=self.CSV_CHUNK_SIZE,
+                                     usecols=lambda column: column not in self.DROPPED_COLUMNS):
+                yield self.index_chunk(chunk)
+            return
+
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+
+        # Processes are spawned rather than forked, as the loading thread runs next to the Tk thread. They inherit
+        # the PerfLog environment variable, so their log is disabled to leave the log file to this process.
+        with ProcessPoolExecutor(min(self.preprocess_workers, len(partitions)),
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=PerfLog.disable) as executor:
+            rows_parsed = 0
+            for chunks in executor.map(partial(DataLoader.parse_partition, data_file, header_end), *zip(*partitions)):
+                for chunk_rows, chunk_columns, token_indexes in chunks:
+                    for values in chunk_columns.values():
+                        values.index += rows_parsed
+                    yield chunk_rows, chunk_columns, token_indexes
+                rows_parsed += sum(chunk[0] for chunk in chunks)
+
+    @classmethod
+    def csv_partitions(cls, data_file: str) -> tuple[int, list[tuple[int, int]]]:
+        """
+        Splits a CSV file into partitions of at least CSV_PARTITION_BYTES that start and end at row boundaries.
+
+        A newline ends a row unless it is inside a quoted value, that is after an odd number of quote characters.
+        Only the quotes are counted up to the end of every partition, the newlines are looked at from there on.
+
+        :param data_file: Path to the CSV file.
+        :return: Tuple of the length of the header and a list of the start and end offsets of every partition.
+        """
+        bounds = []
+        target = 0
+        quoted = False
+        offset = 0
+        with open(data_file, "rb") as file:
+            while block := file.read(cls.CSV_SCAN_BYTES):
+                position = 0
+                while position < len(block):
+                    if offset + position < target:
+                        skipped = min(target - offset, len(block))
+                        quoted ^= block.count(b'"', position, skipped) % 2 == 1
+                        position = skipped
+                        continue
+                    newline = block.find(b"\n", position)
+                    if newline < 0:
+                        quoted ^= block.count(b'"', position) % 2 == 1
+                        break
+                    quoted ^= block.count(b'"', position, newline) % 2 == 1
+                    position = newline + 1
+                    if not quoted:
+                        bounds.append(offset + position)
+                        target = offset + position + cls.CSV_PARTITION_BYTES
+                offset += len(block)
+        if not bounds or bounds[-1] < offset:
+            bounds.append(offset)
+        return bounds[0], list(zip(bounds[:-1], bounds[1:]))
+
+    @classmethod
+    def parse_partition(cls, data_file: str, header_end: int, start: int, end: int) -> list[tuple]:
+        """
+        Parses, preprocesses and token indexes the chunks of one partition of a CSV file, in a worker process.
+
+        :param data_file: Path to the CSV file.
+        :param header_end: Length of the header of the file.
+        :param start: Offset of the partition.
+        :param end: Offset of the end of the partition.
+        :return: List of the chunks of the partition, see ``index_chunk``, whose row index starts at 0.
+        """
+        import io
+        import pandas as pd
+
+        with open(data_file, "rb") as file:
+            header = file.read(header_end)
+            file.seek(start)
+            partition = io.BytesIO(header + file.read(end - start))
+        return [cls.index_chunk(chunk) for chunk in pd.read_csv(
+            partition, dtype=cls.COLUMN_TYPES, chunksize=cls.CSV_CHUNK_SIZE,
+            usecols=lambda column: column not in cls.DROPPED_COLUMNS)]
+
+    @classmethod
+    def index_chunk(cls, chunk: 'pd.DataFrame') -> tuple[int, dict[str, 'pd.Series'], dict[str, 'TokenIndex']]:
+        """
+        Preprocesses and token indexes one chunk of parsed rows.
+
+        :param chunk: DataFrame of parsed rows.
+        :return: Tuple of the number of rows parsed, a dictionary mapping every column to a copy of its preprocessed
+                 values, and a dictionary mapping CATEGORICAL_COLUMNS to their token indexes.
+        """
+        from token_index import TokenIndex
+
+        rows_parsed = len(chunk)
+        chunk = cls.preprocess_data(chunk)
+        return (rows_parsed, {column: chunk[column].copy() for column in chunk.columns},
+                {column: TokenIndex.from_series(chunk[column]) for column in cls.CATEGORICAL_COLUMNS})
+
+    def apply_delta(self, delta_file: str) -> None:
+        """
+        Applies a CSV delta file of upserts and deletes keyed on AppID to the loaded data and its snapshot.
+
+        The delta file has the columns of the data file and an optional DELTA_DELETE_COLUMN. A row whose delete
+        column is true removes the game with its AppID and may leave the other columns empty, any other row replaces
+        the game with its AppID or adds it. The remaining games keep their order and the new versions are appended,
+        so the indexes, sort orders and aggregates are updated from the changed rows only. Row positions change, so
+        ``data_version`` is incremented.
+
+        :param delta_file: Path to the delta file.
+        """
+        import numpy as np
+        import pandas as pd
+        from pandas.api.types import union_categoricals
+        from attribute_statistics import AttributeStatistics
+
+        if not self.wait_until_ready("aggregates"):
+            print(f"Error: cannot apply {delta_file}, the data is not loaded.")
+            return
+        self.report_progress(f"Applying {os.path.basename(delta_file)}")
+        data = self.__data
+        try:
+            delta = pd.read_csv(delta_file, dtype=self.delta_types(),
+                                usecols=lambda column: column not in self.DROPPED_COLUMNS)
+            deleted = (delta.pop(self.DELTA_DELETE_COLUMN).fillna(False).to_numpy(dtype=bool)
+                       if self.DELTA_DELETE_COLUMN in delta else np.zeros(len(delta), dtype=bool))
+            upserts = data.iloc[:0]
+            if not deleted.all():
+                upserts = delta[~deleted].astype({column: column_type for column, column_type
+                                                  in self.COLUMN_TYPES.items() if column in delta})
+                upsert_count = len(upserts)
+                upserts = self.preprocess_data(upserts)
+                if len(upserts) < upsert_count:
+                    print(f"Warning: skipped {upsert_count - len(upserts)} rows of {delta_file} without a Name, "
+                          f"the games with their AppID are left unchanged.")
+                upserts = upserts.drop_duplicates('AppID', keep='last')
+        except FileNotFoundError:
+            print(f"Error: {delta_file} not found.")
+            return
+        except (KeyError, TypeError, ValueError) as error:
+            print(f"Error: could not apply {delta_file} ({error!r}).")
+            return
+
+        # Upserts dropped by the preprocessing leave their games unchanged instead of deleting them.
+        changed = np.isin(data['AppID'].to_numpy(), np.concatenate([delta['AppID'].to_numpy()[deleted],
+                                                                    upserts['AppID'].to_numpy()]))
+        kept, removed = np.flatnonzero(~changed), np.flatnonzero(changed)
+        added = np.arange(len(kept), len(kept) + len(upserts))
+        order = np.concatenate([kept, len(data) + np.arange(len(upserts))])
+        columns = {}
+        for column in data.columns:
+            if isinstance(data[column].dtype, pd.CategoricalDtype):
+                columns[column] = union_categoricals([data[column], upserts[column]]).take(order)
+            else:
+                values = pd.concat([data[column], upserts[column].astype(data[column].dtype)], ignore_index=True)
+                columns[column] = values.take(order).array
+        start = int(data.index.max()) + 1 if len(data) else 0
+        row_index = data.index.take(kept).append(pd.RangeIndex(start, start + len(upserts)))
+        data = pd.DataFrame(columns, index=row_index, copy=False)
+
+        token_indexes = {column: index.updated(kept, upserts[column]) for column, index in self.__token_indexes.items()}
+        text_indexes = {column: index.updated(kept, upserts[column]) for column, index in self.__text_indexes.items()}
+        sort_orders = {attribute: self.merge_sort_order(order, kept, data[attribute].to_numpy())
+                       for attribute, order in self.__sort_orders.items()}
+        attributes = {attribute: data[attribute].to_numpy() for attribute in self.sorting_attributes[1:]}
+        statistics = AttributeStatistics(attributes, sort_orders)
+        release_timeline = self.count_releases(token_indexes["Genres"], data["Release year"].to_numpy())
+        aggregates = self.__aggregates.updated(token_indexes, attributes, removed, added)
+        with self.__lock:
+            self.__data, self.__token_indexes, self.__text_indexes = data, token_indexes, text_indexes
+            self.__sort_orders, self.__statistics, self.__aggregates = sort_orders, statistics, aggregates
+            self.__release_timeline = release_timeline
+            self.data_version += 1
+        if self.snapshot is not None:
+            self.report_progress("Writing snapshot")
+            self.snapshot.save(data, self.snapshot.deltas + [{"file": os.path.basename(delta_file),
+                                                              "sha256": self.snapshot.hash_file(delta_file),
+                                                              "upserts": len(upserts), "deletes": int(deleted.sum())}])
+        self.report_progress("Ready", len(data))
+
+    def delta_types(self) -> defaultdict:
+        """
+        Retrieves the column types used to parse a delta file.
+
+        Integer and boolean columns are parsed as nullable types, since delete rows may leave them empty, and
+        columns without a type are parsed as text.
+
+        :return: Dictionary mapping column names to pandas types.
+        """
+        column_types = {column: self.NULLABLE_TYPES.get(column_type, column_type)
+                        for column, column_type in self.COLUMN_TYPES.items()}
+        column_types.update({'AppID': 'int32', self.DELTA_DELETE_COLUMN: 'boolean'})
+        return defaultdict(lambda: 'str', column_types)
+
+    @staticmethod
+    def merge_sort_order(order: 'np.ndarray', kept: 'np.ndarray', values: 'np.ndarray') -> 'np.ndarray':
+        """
+        Updates a stable ascending argsort after removing rows and appending new ones.
+
+        :param order: Stable argsort of the current data.
+        :param kept: Ascending positions in the current data of the rows kept, which come first in the new data.
+        :param values: Values of the new data.
+        :return: Stable argsort of the values as an int32 array.
+        """
+        import numpy as np
+
+        positions = np.full(len(order), -1, dtype=np.int64)
+        positions[kept] = np.arange(len(kept))
+        kept_order = positions[order]
+        kept_order = kept_order[kept_order >= 0]
+        added = len(kept) + np.argsort(values[len(kept):], kind="stable")
+        insert_at = np.searchsorted(values[kept_order], values[added], side="right")
+        return np.insert(kept_order, insert_at, added).astype(np.int32)
+
+    @staticmethod
+    def platform_bits(windows, mac, linux):
+        """
+        Encodes platform flags into a bitmask with Windows as bit 0, Mac as bit 1 and Linux as bit 2.
+
+        :param windows: Flag, or array of flags, indicating Windows support.
+        :param mac: Flag, or array of flags, indicating Mac support.
+        :param linux: Flag, or array of flags, indicating Linux support.
+        :return: The uint8 platform bitmask, or an array of bitmasks.
+        """
+        import numpy as np
+
+        return (np.asarray(windows, dtype=np.uint8) | np.asarray(mac, dtype=np.uint8) << 1 |
+                np.asarray(linux, dtype=np.uint8) << 2)
+
+    def build_token_indexes(self) -> None:
+        """
+        Builds the token index of every categorical column of the loaded data.
+        """
+        from token_index import TokenIndex
+
+        self.__token_indexes = {column: TokenIndex.from_series(self.__data[column])
+                                for column in self.CATEGORICAL_COLUMNS}
+
+    def build_text_indexes(self) -> None:
+        """
+        Builds the trigram index of every searchable text column of the loaded data.
+        """
+        from trigram_index import TrigramIndex
+
+        self.__text_indexes = {column: TrigramIndex(self.__data[column]) for column in self.TEXT_SEARCH_COLUMNS}
+
+    def build_sort_orders(self) -> None:
+        """
+        Builds a stable ascending argsort of the loaded data for every sorting attribute.
+        """
+        import numpy as np
+
+        self.__sort_orders = {attribute: np.argsort(self.__data[attribute].to_numpy(), kind="stable").astype(np.int32)
+                              for attribute in self.sorting_attributes[1:]}
+
+    def build_statistics(self) -> None:
+        """
+        Computes the descriptive statistics of every sorting attribute of the loaded data from its sort order.
+        """
+        from attribute_statistics import AttributeStatistics
+
+        self.__statistics = AttributeStatistics({attribute: self.__data[attribute].to_numpy()
+                                                 for attribute in self.sorting_attributes[1:]}, self.__sort_orders)
+
+    def build_release_timeline(self) -> None:
+        """
+        Counts the games of the loaded data released each year per genre.
+        """
+        self.__release_timeline = self.count_releases(self.token_indexes["Genres"],
+                                                      self.__data["Release year"].to_numpy())
+
+    @staticmethod
+    def count_releases(genres: 'TokenIndex', years: 'np.ndarray') -> 'pd.DataFrame':
+        """
+        Counts games per release year and genre, a game with several genres counting once for each of them.
+
+        :param genres: TokenIndex of the genres of the games.
+        :param years: Release year of every game, 0 if unknown.
+        :return: DataFrame indexed by every year from the first to the last release, with one column of counts per
+                 genre of the vocabulary.
+        """
+        import numpy as np
+        import pandas as pd
+
+        tokens, owners = genres.row_tokens_of(np.arange(len(years)))
+        token_years = years[owners].astype(np.int64)
+        known = token_years > 0
+        tokens, token_years = tokens[known], token_years[known]
+        first = int(token_years.min()) if len(token_years) else 0
+        span = int(token_years.max()) - first + 1 if len(token_years) else 0
+        size = len(genres.vocabulary)
+        counts = np.bincount((token_years - first) * size + tokens, minlength=span * size).reshape(span, size)
+        return pd.DataFrame(counts, index=pd.RangeIndex(first, first + span, name="Release year"),
+                            columns=pd.Index(genres.vocabulary, name="Genres"))
+
+    def build_aggregates(self) -> None:
+        """
+        Builds the aggregate cube of the sorting attributes over the categorical columns of the loaded data.
+        """
+        from aggregate_cube import AggregateCube
+
+        self.__aggregates = AggregateCube(self.token_indexes, {attribute: self.__data[attribute].to_numpy()
+                                                               for attribute in self.sorting_attributes[1:]})
 
     @staticmethod
-    def combine_platform(game) -> str:
-        """
-        Combines platform information for a game into a single string.
-
-        :param game: A row representing a game in the DataFrame.
-        :return: A string containing the combined platform information.
-        """
-        platform = []
-        if game["Windows"]:
-            platform.append("Windows")
-        if game["Mac"]:
-            platform.append("Mac")
-        if game["Linux"]:
-            platform.append("Linux")
-        return ",".join(platform)
-
-    def preprocess_data(self) -> None:
-        """
-        Preprocesses the loaded data.
-        """
-        self.__data = self.__data.drop(columns=['Score rank', 'Reviews', 'Metacritic url', 'Notes'])
-        self.__data = self.__data.dropna(subset=['Name'])
-        self.__data[['About the game', 'Website', 'Support url', 'Support email', 'Screenshots', 'Movies']] = \
-            (self.__data[['About the game', 'Website', 'Support url', 'Support email', 'Screenshots', 'Movies']].fillna
-                ("Information not available"))
-        self.__data[['Developers', 'Publishers', 'Categories', 'Genres', 'Tags']] = \
-            (self.__data[['Developers', 'Publishers', 'Categories', 'Genres', 'Tags']].fillna("Unknown"))
-        self.__data["Platform"] = self.__data.apply(self.combine_platform, axis=1)
+    def fill_missing(data: 'pd.DataFrame', columns: list[str], value: str) -> None:
+        """
+        Fills missing values of the given columns, adding the value to the categories of categorical columns.
+
+        :param data: DataFrame whose columns are filled in place.
+        :param columns: Names of the columns to fill.
+        :param value: The value used for missing entries.
+        """
+        import pandas as pd
+
+        for column in columns:
+            values = data[column]
+            if isinstance(values.dtype, pd.CategoricalDtype) and value not in values.cat.categories:
+                values = values.cat.add_categories(value)
+            data[column] = values.fillna(value)
+
+    @classmethod
+    @PerfLog.timed()
+    def preprocess_data(cls, data: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Preprocesses a block of parsed rows.
+
+        :param data: DataFrame of parsed rows, such as one chunk of the data file.
+        :return: The preprocessed DataFrame.
+        """
+        import pandas as pd
+
+        data = data.drop(columns=cls.DROPPED_COLUMNS, errors='ignore')
+        data = data.dropna(subset=['Name'])
+        cls.fill_missing(data, ['About the game', 'Website', 'Support url', 'Support email', 'Screenshots',
+                                'Movies'], "Information not available")
+        cls.fill_missing(data, ['Developers', 'Publishers', 'Categories', 'Genres', 'Tags'], "Unknown")
+        platform_mask = cls.platform_bits(data["Windows"], data["Mac"], data["Linux"])
+        data["Platform"] = pd.Categorical.from_codes(platform_mask, categories=cls.PLATFORM_LABELS)
+        data["Release year"], data["Release month"] = cls.parse_release_dates(data["Release date"])
+        PerfLog.annotate(rows=len(data))
+        return data
+
+    @classmethod
+    def parse_release_dates(cls, dates: 'pd.Series') -> tuple['np.ndarray', 'np.ndarray']:
+        """
+        Parses release dates such as "Oct 21, 2008" or "Oct 2008", each distinct date only once.
+
+        :param dates: The release dates.
+        :return: Tuple of the uint16 release year and uint8 release month of every date, 0 where unknown.
+        """
+        import numpy as np
+        import pandas as pd
+
+        codes, uniques = pd.factorize(dates)
+        uniques = [str(date) for date in uniques]
+        years = np.array([int(date[-4:]) if date[-4:].isdigit() else 0 for date in uniques] + [0], dtype=np.uint16)
+        months = np.array([cls.MONTHS.get(date[:3], 0) for date in uniques] + [0], dtype=np.uint8)
+        return years[codes], months[codes]
@@ -1,26 +1,46 @@
 import tkinter as tk
+from typing import Optional
 from data_loader import DataLoader
+from perf_log import PerfLog
+from result_cache import ResultCache
 import pandas as pd
 import matplotlib
-import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm, Normalize
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import numpy as np
 
-matplotlib.use("TkAgg")
-
 
 class GraphController:
     """
     A class that manages graph-related operations.
+
+    The data behind every graph is computed by a ``*_data`` method and memoized in a ResultCache shared by all
+    controllers, so revisiting a view only draws it again; plain column values are returned uncached. Each controller
+    owns one figure and canvas, created on the first draw, whose artists are updated in place by the following draws.
+    The ``*_data`` methods are thread safe and may run on a GraphWorker, the drawing methods must run on the Tk thread.
+    Without a parent widget, the drawing methods draw on an Agg canvas instead and return the figure, so graphs can be
+    rendered to files without Tk, whose backend is only loaded for the first Tk canvas. With the PerfLog enabled, the
+    ``*_data`` methods are logged as the compute phase and the drawing methods and the deferred canvas rendering as the
+    draw phase.
     """
 
+    cache = ResultCache()
+    DENSITY_THRESHOLD = 10_000
+    DENSITY_BINS = 100
+
     def __init__(self) -> None:
         """
         Initializes the GraphController instance.
         """
         self.data_loader = DataLoader.get_instance()
+        # Row positions of the games compared in the dashboard, or None to compare all games.
         self.selected_games = None
+        # Number of points above which the relationship graph is drawn as a density histogram.
+        self.density_threshold = self.DENSITY_THRESHOLD
+        self.figure = None
+        self.canvas = None
+        self.artists = {}
 
     def get_data(self) -> pd.DataFrame:
         """
@@ -73,25 +93,112 @@ class GraphController:
         """
         return ["Platform", "Categories", "Genres", "Tags"]
 
+    def get_cache_stats(self) -> dict[str, int]:
+        """
+        Retrieves the counters of the graph data cache.
+
+        :return: Dictionary of the hits, misses, evictions, number of entries and total size in bytes.
+        """
+        return self.cache.stats
+
+    def cached(self, key: tuple, compute):
+        """
+        Retrieves the result of a graph computation from the cache, computing it on a miss.
+
+        The key is extended with the data version, so results computed before a delta was applied are not reused.
+
+        :param key: Tuple of the computation name and its parameters.
+        :param compute: Function called without arguments to compute the result.
+        :return: The result.
+        """
+        return self.cache.get_or_compute((self.data_loader.data_version,) + key, compute)
+
+    def get_axes(self, parent, figsize: tuple[float, float]):
+        """
+        Retrieves the axes of the controller figure, creating the figure and its canvas on first use.
+
+        The figure is not registered with pyplot, it lives as long as the controller or until ``close_canvas``.
+
+        :param parent: The parent tkinter widget where the canvas is embedded, or None for an Agg canvas.
+        :param figsize: Size of the figure in inches.
+        :return: The axes of the figure.
+        """
+        if self.canvas is None:
+            self.figure = Figure(figsize=figsize)
+            self.figure.add_subplot(111)
+            if parent is None:
+                self.canvas = FigureCanvasAgg(self.figure)
+            else:
+                matplotlib.use("TkAgg")
+                from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+                self.canvas = FigureCanvasTkAgg(self.figure, master=parent)
+                # draw_idle renders the figure later from the Tk event loop, so the rendering is timed on its own.
+                self.canvas.draw = PerfLog.timed("GraphController.render", phase="draw")(self.canvas.draw)
+        return self.figure.axes[0]
+
+    def show_canvas(self):
+        """
+        Schedules the drawing of the canvas on the Tk event loop.
+
+        :return: The Tkinter widget of the canvas, or the figure if it is drawn on an Agg canvas.
+        """
+        if not hasattr(self.canvas, "get_tk_widget"):
+            return self.figure
+        self.canvas.draw_idle()
+        return self.canvas.get_tk_widget()
+
+    def close_canvas(self) -> None:
+        """
+        Releases the figure and canvas of the controller and the artists drawn on them.
+        """
+        if self.figure is not None:
+            self.figure.clear()
+        self.figure = None
+        self.canvas = None
+        self.artists.clear()
+
+    @PerfLog.timed(phase="compute")
     def get_descriptive_statistics(self, attribute: str) -> pd.Series:
         """
-        Shows descriptive statistics of an attribute.
+        Shows descriptive statistics of an attribute over the selected games, or all games without selection.
+
+        The statistics of all games are computed at load, those of a selection are read from the sort order of
+        the attribute without sorting the selected values.
 
         :param attribute: The attribute for which statistics are calculated.
         :return: Series containing descriptive statistics.
         """
-        return self.get_data()[attribute].describe()
+        selected_games = self.selected_games
+        if selected_games is None:
+            return self.data_loader.statistics.describe(attribute)
+        return self.cached(("statistics", attribute, ResultCache.fingerprint(selected_games)),
+                           lambda: self.data_loader.statistics.describe(attribute, selected_games))
+
+    @PerfLog.timed(phase="compute")
+    def price_dist_data(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the histogram of the base-10 logarithm of the prices, counting free games at a price of 0.1.
 
-    def price_dist_graph(self, parent) -> tk.Widget:
+        :return: Tuple of the counts and the edges of the 20 bins.
+        """
+        return self.cached(("price_dist",),
+                           lambda: np.histogram(np.log10(self.get_data()["Price"].replace(0, 0.1)), bins=20))
+
+    @PerfLog.timed(phase="draw")
+    def price_dist_graph(self, parent) -> 'tk.Widget | Figure':
         """
         Creates a price distribution histogram graph.
 
-        :param parent: The parent tkinter widget where the graph will be embedded.
-        :return: The Tkinter widget containing the price distribution histogram graph.
+        :param parent: The parent tkinter widget where the graph will be embedded, or None to draw without Tk.
+        :return: The Tkinter widget containing the price distribution histogram graph, or the figure without
+                 parent.
         """
-        fig, ax = plt.subplots(figsize=(8, 6))
+        counts, edges = self.price_dist_data()
+        ax = self.get_axes(parent, (8, 6))
+        ax.clear()
 
-        ax.hist(np.log10(self.get_data()["Price"].replace(0, 0.1)), bins=20)
+        ax.hist(edges[:-1], bins=edges, weights=counts)
         ax.set_xlabel('Price')
         ax.set_ylabel('Frequency')
         ax.set_title('Price Distribution')
@@ -100,105 +207,233 @@ class GraphController:
         xtick_labels = [10 ** tick if tick % 1 == 0 else "" for tick in xticks]
         ax.set_xticklabels(xtick_labels)
 
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
-
-        return canvas.get_tk_widget()
+        return self.show_canvas()
 
-    def released_year_graph(self, parent) -> tk.Widget:
+    @PerfLog.timed(phase="compute")
+    def released_year_data(self) -> pd.DataFrame:
         """
-        Creates a graph showing the number of games released each year based on top genres.
+        Counts the games released each year for the five most frequent genres.
 
-        :param parent: The parent tkinter widget where the graph will be embedded.
-        :return: The Tkinter widget containing the released year graph.
+        :return: DataFrame indexed by release year with one column of counts per genre.
         """
+        def compute() -> pd.DataFrame:
+            release_timeline = self.data_loader.release_timeline
+            return release_timeline[release_timeline.sum().nlargest(5).index]
 
-        data = self.get_data().copy()
-        data["Genres"] = data["Genres"].copy().str.split(",").explode('Genres')
-        data["Release Year"] = data["Release date"].str.slice(-4).astype('int')
+        return self.cached(("released_year",), compute)
 
-        genre_counts = data.groupby(['Release Year', 'Genres']).size().unstack(fill_value=0)
+    @PerfLog.timed(phase="draw")
+    def released_year_graph(self, parent) -> 'tk.Widget | Figure':
+        """
+        Creates a graph showing the number of games released each year based on top genres.
 
-        top_genres = genre_counts.sum().nlargest(5).index
+        :param parent: The parent tkinter widget where the graph will be embedded, or None to draw without Tk.
+        :return: The Tkinter widget containing the released year graph, or the figure without parent.
+        """
+        genre_counts = self.released_year_data()
+        ax = self.get_axes(parent, (10, 6))
+        ax.clear()
 
-        ax = genre_counts[top_genres].plot(figsize=(10, 6), marker='o', linestyle='-')
+        for genre in genre_counts.columns:
+            ax.plot(genre_counts.index, genre_counts[genre], marker='o', linestyle='-', label=genre)
+        if len(genre_counts.columns):
+            ax.legend(title=genre_counts.columns.name)
 
         # Set titles and labels
         ax.set_title('Number of games released each year based on top 5 genres')
         ax.set_xlabel('Release Year')
         ax.set_ylabel('Number of Games')
-        years = range(data['Release Year'].min(), data['Release Year'].max() + 1)
-        ax.set_xticks(years)
-        xtick_labels = [year if year % 5 == 0 else "" for year in years]
-        ax.set_xticklabels(xtick_labels, rotation=90)
+        # Without any release date the timeline is empty and the axes are left without year ticks.
+        if len(genre_counts.index):
+            years = range(genre_counts.index.min(), genre_counts.index.max() + 1)
+            ax.set_xticks(years)
+            xtick_labels = [year if year % 5 == 0 else "" for year in years]
+            ax.set_xticklabels(xtick_labels, rotation=90)
+
+        ax.grid(True)
 
-        ax.grid()
+        return self.show_canvas()
 
-        canvas = FigureCanvasTkAgg(ax.get_figure(), master=parent)
-        canvas.draw()
+    @PerfLog.timed(phase="compute")
+    def relationship_data(self, left_col, right_col) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Retrieves the values of two columns to plot against each other.
 
-        return canvas.get_tk_widget()
+        The values are read straight from the columns, so they are not cached, unlike the data derived from them.
 
-    def relationship_graph(self, parent, left_col, right_col) -> tk.Widget:
+        :param left_col: The name of the column plotted on the x-axis.
+        :param right_col: The name of the column plotted on the y-axis.
+        :return: Tuple of the x and y values.
         """
-        Creates a scatter plot to show the relationship between two columns.
-        :param parent: The parent tkinter widget where the graph will be embedded.
-        :param left_col: The name of the column to be plotted on the x-axis.
-        :param right_col: The name of the column to be plotted on the y-axis.
-        :return: The Tkinter widget containing the scatter plot.
+        data = self.get_data()
+        return data[left_col].to_numpy(), data[right_col].to_numpy()
+
+    @PerfLog.timed(phase="compute")
+    def relationship_density_data(self, left_col, right_col,
+                                  bins: int = DENSITY_BINS) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        fig = Figure(figsize=(8, 6))
-        ax = fig.add_subplot(111)
+        Counts the games in a grid of bins over the values of two columns.
 
-        data = self.get_data()
-        x_data = data[left_col]
-        y_data = data[right_col]
+        :param left_col: The name of the column on the x-axis.
+        :param right_col: The name of the column on the y-axis.
+        :param bins: Number of bins along each axis.
+        :return: Tuple of the counts, of shape (x bins, y bins), and the x and y bin edges.
+        """
+        def compute() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+            x_data, y_data = self.relationship_data(left_col, right_col)
+            return np.histogram2d(x_data, y_data, bins=bins)
+
+        return self.cached(("relationship_density", left_col, right_col, bins), compute)
 
-        ax.scatter(x_data, y_data)
+    @PerfLog.timed(phase="compute")
+    def relationship_graph_data(self, left_col, right_col, density=None) -> tuple[bool, tuple]:
+        """
+        Retrieves the data drawn by the relationship graph, the density grid above ``density_threshold`` games and
+        the values of the columns otherwise.
+
+        :param left_col: The name of the column on the x-axis.
+        :param right_col: The name of the column on the y-axis.
+        :param density: Whether to draw a density histogram, or None to decide from the number of games.
+        :return: Tuple of whether the graph is a density histogram and its data, as returned by
+                 ``relationship_density_data`` or ``relationship_data``.
+        """
+        if density is None:
+            density = len(self.get_data()) > self.density_threshold
+        if density:
+            return True, self.relationship_density_data(left_col, right_col)
+        return False, self.relationship_data(left_col, right_col)
+
+    @PerfLog.timed(phase="draw")
+    def relationship_graph(self, parent, left_col, right_col, density=None, log_scale: bool = True,
+                           graph_data: Optional[tuple[bool, tuple]] = None) -> 'tk.Widget | Figure':
+        """
+        Draws a plot to show the relationship between two columns.
+
+        Up to ``density_threshold`` games are drawn as a scatter plot, more games as a density histogram whose
+        drawing cost depends on the number of bins instead of the number of games. The scatter points and the
+        histogram image are created once and their data is replaced on the following calls.
+
+        :param parent: The parent tkinter widget where the graph will be embedded, or None to draw without Tk.
+        :param left_col: The name of the column to be plotted on the x-axis.
+        :param right_col: The name of the column to be plotted on the y-axis.
+        :param density: Whether to draw a density histogram, or None to decide from the number of games.
+        :param log_scale: Whether the colors of the density histogram follow the logarithm of the counts.
+        :param graph_data: The data returned by ``relationship_graph_data`` for these columns, or None to get it
+                           here, in which case ``density`` is passed on.
+        :return: The Tkinter widget containing the plot, or the figure without parent.
+        """
+        ax = self.get_axes(parent, (8, 6))
+        if graph_data is None:
+            graph_data = self.relationship_graph_data(left_col, right_col, density)
+        density, data = graph_data
+
+        if density:
+            counts, x_edges, y_edges = data
+            counts = np.ma.masked_equal(counts.T, 0)
+            extent = (x_edges[0], x_edges[-1], y_edges[0], y_edges[-1])
+            norm = LogNorm() if log_scale else Normalize()
+            if "density" not in self.artists:
+                self.artists["density"] = ax.imshow(counts, extent=extent, norm=norm, origin="lower", aspect="auto",
+                                                    interpolation="nearest")
+                self.artists["colorbar"] = self.figure.colorbar(self.artists["density"], ax=ax,
+                                                                label="Number of games")
+            else:
+                self.artists["density"].set_data(counts)
+                self.artists["density"].set_extent(extent)
+                self.artists["density"].set_norm(norm)
+                self.artists["density"].autoscale()
+                self.artists["colorbar"].update_normal(self.artists["density"])
+            ax.set_xlim(extent[:2])
+            ax.set_ylim(extent[2:])
+        else:
+            x_data, y_data = data
+            points = np.column_stack((x_data, y_data))
+            if "scatter" not in self.artists:
+                self.artists["scatter"] = ax.scatter(x_data, y_data)
+            else:
+                self.artists["scatter"].set_offsets(points)
+            ax.ignore_existing_data_limits = True
+            ax.update_datalim(points)
+            ax.set_autoscale_on(True)
+            ax.autoscale_view()
+
+        if "scatter" in self.artists:
+            self.artists["scatter"].set_visible(not density)
+        if "density" in self.artists:
+            self.artists["density"].set_visible(density)
+            self.artists["colorbar"].ax.set_visible(density)
         ax.set_xlabel(left_col)
         ax.set_ylabel(right_col)
 
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
+        return self.show_canvas()
+
+    @PerfLog.timed(phase="compute")
+    def dashboard_data(self, left_col, right_col, group_by_col) -> pd.DataFrame:
+        """
+        Computes the mean of a column for the five most frequent values of a categorical column.
 
-        return canvas.get_tk_widget()
+        The means over all games are read from the precomputed aggregates of the DataLoader, the means over the
+        selected games are aggregated from their row positions without copying the data.
 
-    def dashboard_graph(self, parent, left_col, right_col, group_by_col) -> tk.Widget:
+        :param left_col: The categorical column whose most frequent values are compared.
+        :param right_col: The numeric column to average.
+        :param group_by_col: The categorical column whose five most frequent values split each mean, or "None".
+        :return: DataFrame indexed by the values of left_col, in decreasing order of frequency, with one column per
+                 value of group_by_col (or a single right_col column without grouping).
+        """
+        def compute() -> pd.DataFrame:
+            group = None if group_by_col == "None" else group_by_col
+            left_values, group_values, means = self.data_loader.aggregates.means(left_col, right_col, group,
+                                                                                 selected_games)
+            return pd.DataFrame(means, index=pd.Index(left_values, name=left_col), columns=group_values)
+
+        selected_games = self.selected_games
+        return self.cached(("dashboard", left_col, right_col, group_by_col, ResultCache.fingerprint(selected_games)),
+                           compute)
+
+    @PerfLog.timed(phase="draw")
+    def dashboard_graph(self, parent, left_col, right_col, group_by_col,
+                        data: Optional[pd.DataFrame] = None) -> 'tk.Widget | Figure':
         """
-        Creates a graph for the dashboard.
+        Draws the graph of the dashboard.
 
-        :param parent: The parent tkinter widget where the graph will be embedded.
+        The bars are created again only when the number of bars changes, otherwise their heights, labels and the
+        tick labels are updated in place.
+
+        :param parent: The parent tkinter widget where the graph will be embedded, or None to draw without Tk.
         :param left_col: The name of the column to be plotted on the x-axis.
         :param right_col: The name of the column to be plotted on the y-axis.
         :param group_by_col: The column by which the data will be grouped.
-        :return: The Tkinter widget containing the dashboard graph.
+        :param data: The means returned by ``dashboard_data`` for these columns, or None to get them here.
+        :return: The Tkinter widget containing the dashboard graph, or the figure without parent.
         """
-        if isinstance(self.selected_games, pd.DataFrame):
-            data = self.selected_games.copy()
+        if data is None:
+            data = self.dashboard_data(left_col, right_col, group_by_col)
+        heights = np.nan_to_num(data.to_numpy())
+        ax = self.get_axes(parent, (10, 8))
+
+        if self.artists.get("bars_shape") != heights.shape:
+            ax.clear()
+            positions = np.arange(heights.shape[0])
+            width = 0.5 / max(heights.shape[1], 1)
+            offsets = width * (np.arange(heights.shape[1]) - (heights.shape[1] - 1) / 2)
+            self.artists["bars"] = [ax.bar(positions + offset, column_heights, width)
+                                    for offset, column_heights in zip(offsets, heights.T)]
+            self.artists["bars_shape"] = heights.shape
+            ax.set_xticks(positions)
+            ax.grid(True)
         else:
-            data = self.get_data().copy()
-        top_left_values = data[left_col].str.split(",").explode().value_counts().nlargest(5).index
-        data[left_col] = data[left_col].apply(lambda x: [val for val in x.split(",") if val in top_left_values])
-
-        fig = Figure(figsize=(10, 8))
-        ax = fig.add_subplot(111)
+            for bars, column_heights in zip(self.artists["bars"], heights.T):
+                for bar, height in zip(bars, column_heights):
+                    bar.set_height(height)
 
-        if group_by_col == "None" or left_col == group_by_col:
-            data.explode(left_col).groupby(left_col)[right_col].mean().plot(kind="bar", ax=ax)
-        else:
-            top_values = data[group_by_col].str.split(",").explode().value_counts().nlargest(5).index
-            data[group_by_col] = data[group_by_col].apply(lambda x: [val for val in x.split(",") if val in top_values])
-            grouped_data = data.explode(left_col).explode(group_by_col).groupby([left_col, group_by_col])[
-                right_col].mean().unstack()
-            grouped_data.plot(kind="bar", ax=ax)
-
-        ax.set_xticklabels(labels=top_left_values.to_list(), rotation=0)
+        for bars, label in zip(self.artists["bars"], data.columns):
+            bars.set_label(str(label))
+        ax.set_xticklabels(labels=data.index.to_list(), rotation=0)
         ax.set_xlabel(left_col)
         ax.set_ylabel(right_col)
         ax.legend()
-        ax.grid()
-
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
+        ax.relim()
+        ax.autoscale_view()
 
-        return canvas.get_tk_widget()
+        return self.show_canvas()
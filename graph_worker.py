@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class GraphWorker:
+    """
+    Runs graph computations on a single worker thread shared by all menus and renders their results on the Tk thread.
+
+    Every request gets a generation number. A new request cancels the previous one if it has not started yet and
+    the result of a superseded request is dropped, so only the latest selection is rendered. The computation must
+    only return data, the render function is called from the Tk event loop.
+    """
+
+    POLL_INTERVAL = 20
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="GraphWorker")
+
+    def __init__(self, widget, on_busy=None) -> None:
+        """
+        Initializes the GraphWorker instance.
+
+        :param widget: The widget whose event loop polls the computations and renders their results.
+        :param on_busy: Function called with True when a request starts and False when the latest request is done.
+        """
+        self.widget = widget
+        self.on_busy = on_busy
+        self.generation = 0
+        self.pending = None
+        self.poll_job = None
+
+    def request(self, compute, render) -> int:
+        """
+        Starts a computation, superseding the pending one.
+
+        :param compute: Function called without arguments on the worker thread, returning the data to render.
+        :param render: Function called with the computed data on the Tk thread.
+        :return: The generation number of the request.
+        """
+        self.generation += 1
+        if self.pending is not None:
+            self.pending[1].cancel()
+        self.pending = (self.generation, self.executor.submit(compute), render)
+        if self.on_busy is not None:
+            self.on_busy(True)
+        if self.poll_job is None:
+            self.poll_job = self.widget.after(self.POLL_INTERVAL, self.poll)
+        return self.generation
+
+    def is_current(self, generation: int) -> bool:
+        """
+        Checks whether a request is still the latest one, so long computations can stop early.
+
+        :param generation: The generation number returned by ``request``.
+        :return: True if no newer request was made, False otherwise.
+        """
+        return generation == self.generation
+
+    def poll(self) -> None:
+        """
+        Renders the result of the latest request once it is computed, polling again until then.
+        """
+        self.poll_job = None
+        if self.pending is None:
+            return
+        generation, future, render = self.pending
+        if not future.done():
+            self.poll_job = self.widget.after(self.POLL_INTERVAL, self.poll)
+            return
+        self.pending = None
+        if self.on_busy is not None:
+            self.on_busy(False)
+        if not self.is_current(generation) or future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Error: could not compute the graph ({error!r}).")
+            return
+        render(future.result())
+
+    def cancel(self) -> None:
+        """
+        Cancels the pending request and stops polling.
+        """
+        self.generation += 1
+        if self.pending is not None:
+            self.pending[1].cancel()
+            self.pending = None
+        if self.poll_job is not None:
+            self.widget.after_cancel(self.poll_job)
+            self.poll_job = None
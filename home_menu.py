@@ -44,31 +44,45 @@ class HomeMenu(tk.Frame):
         dashboard_frame = tk.LabelFrame(self, text="Dashboard", foreground="white", background="#2A475E", **option)
         dashboard_frame.pack(pady=20)
 
-        insights_dash_button = tk.Button(dashboard_frame, text="Games Insights Dashboard",
+        insights_dash_button = tk.Button(dashboard_frame, text="Games Insights Dashboard", state=tk.DISABLED,
                                          command=lambda: self.parent.change_to_menu(self.parent.dashboard_menu),
                                          **option)
         insights_dash_button.grid(row=0, column=0, sticky="nsew", **padding)
 
-        prices_dis_button = tk.Button(dashboard_frame, text="Games Prices Distribution",
+        prices_dis_button = tk.Button(dashboard_frame, text="Games Prices Distribution", state=tk.DISABLED,
                                       command=lambda: self.parent.change_to_menu(self.parent.price_dist_menu),
                                       **option)
         prices_dis_button.grid(row=0, column=1, sticky="nsew", **padding)
 
-        relationships_button = tk.Button(dashboard_frame, text="Games Relationships",
+        relationships_button = tk.Button(dashboard_frame, text="Games Relationships", state=tk.DISABLED,
                                          command=lambda: self.parent.change_to_menu(self.parent.relationship_menu),
                                          **option)
         relationships_button.grid(row=1, column=0, sticky="nsew", **padding)
 
-        released_year_button = tk.Button(dashboard_frame, text="Games released each year",
+        released_year_button = tk.Button(dashboard_frame, text="Games released each year", state=tk.DISABLED,
                                          command=lambda: self.parent.change_to_menu(self.parent.released_year_menu),
                                          **option)
         released_year_button.grid(row=1, column=1, sticky="nsew", **padding)
 
+        self.menu_buttons = {"dashboard_menu": insights_dash_button, "price_dist_menu": prices_dis_button,
+                             "relationship_menu": relationships_button, "released_year_menu": released_year_button}
+
+    def enable_menu(self, attribute: str) -> None:
+        """
+        Enables the controls leading to a menu once the menu is ready.
+
+        :param attribute: Name of the SteamLensUI attribute holding the menu.
+        """
+        if attribute in self.menu_buttons:
+            self.menu_buttons[attribute].config(state=tk.NORMAL)
+        elif attribute == "search_menu":
+            self.key_release_search_bar()
+
     def key_release_search_bar(self, *args) -> None:
         """
         Handles the key release event in the search bar.
         """
-        if self.search_entry.get():
+        if self.search_entry.get() and self.parent.is_menu_ready("search_menu"):
             self.search_button.config(foreground="black", state=tk.NORMAL)
         else:
             self.search_button.config(foreground="gray", state=tk.DISABLED)
@@ -77,6 +91,8 @@ class HomeMenu(tk.Frame):
         """
         Handles the click event of the search button.
         """
+        if not self.parent.is_menu_ready("search_menu"):
+            return
         self.parent.search_menu.search_entry.set(self.search_entry.get())
         self.parent.search_menu.search()
         self.parent.change_to_menu(self.parent.search_menu)
@@ -0,0 +1,81 @@
+import argparse
+import subprocess
+import sys
+
+
+class ImportBudget:
+    """
+    Measures the cold import time of a module with ``python -X importtime`` and checks it against a budget.
+
+    The import runs in a fresh interpreter for every measurement and the fastest run is kept, so the result
+    does not depend on modules already imported by the caller.
+    """
+
+    DEFERRED_MODULES = ["pandas", "numpy", "matplotlib"]
+
+    def __init__(self, module: str, budget_ms: float, repeat: int = 5) -> None:
+        """
+        Initializes the ImportBudget instance.
+
+        :param module: Name of the module to import.
+        :param budget_ms: Maximum allowed cumulative import time of the module, in milliseconds.
+        :param repeat: Number of measurements, the fastest one is reported.
+        """
+        self.module = module
+        self.budget_ms = budget_ms
+        self.repeat = repeat
+
+    def measure(self) -> dict[str, float]:
+        """
+        Imports the module once in a fresh interpreter.
+
+        :return: Dictionary mapping every imported top-level or nested module to its cumulative time in ms.
+        """
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {self.module}"],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"import {self.module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+        timings = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            timings[name.strip()] = int(cumulative) / 1000
+        return timings
+
+    def run(self, top: int = 10) -> bool:
+        """
+        Measures the import, prints the slowest modules and checks the budget.
+
+        The check fails if the module takes longer than the budget or pulls in any of DEFERRED_MODULES.
+
+        :param top: Number of slowest modules to print.
+        :return: True if the import is within budget, False otherwise.
+        """
+        try:
+            timings = min((self.measure() for _ in range(self.repeat)), key=lambda timing: timing[self.module])
+        except RuntimeError as error:
+            print(f"Error: {error}")
+            return False
+        total = timings[self.module]
+        print(f"import {self.module}: {total:.1f} ms (budget {self.budget_ms:.1f} ms, best of {self.repeat})")
+        for name, cumulative in sorted(timings.items(), key=lambda item: item[1], reverse=True)[:top]:
+            print(f"  {cumulative:8.1f} ms  {name}")
+
+        loaded = [module for module in self.DEFERRED_MODULES if module in timings]
+        if loaded:
+            print(f"Error: {', '.join(loaded)} imported at startup.")
+        if total > self.budget_ms:
+            print(f"Error: import {self.module} is over budget by {total - self.budget_ms:.1f} ms.")
+        return not loaded and total <= self.budget_ms
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check the cold import time of SteamLens against a budget.")
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--budget-ms", type=float, default=150, help="allowed import time in ms (default: 150)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of measurements (default: 5)")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules to list (default: 10)")
+    arguments = parser.parse_args()
+    budget = ImportBudget(arguments.module, arguments.budget_ms, arguments.repeat)
+    sys.exit(0 if budget.run(arguments.top) else 1)
@@ -5,6 +5,6 @@ DATA_FILE = "games.csv"
 
 
 if __name__ == '__main__':
-    data_loader = DataLoader(DATA_FILE).get_instance()
+    data_loader = DataLoader(DATA_FILE, background=True).get_instance()
     ui = SteamLensUI()
     ui.run()
@@ -0,0 +1,235 @@
+import os
+import threading
+import time
+from functools import wraps
+from typing import Optional
+
+
+class PerfSpan:
+    """
+    A timed section of code, written to the performance log as one JSON object when it ends.
+
+    Spans nest per thread: the record of a span names its parent and gives, besides its duration, its self time
+    spent outside nested spans. With memory tracking, it also gives the change of traced memory and its peak above
+    the memory at the start of the span. The peaks are process wide, so they are approximate while spans run on
+    several threads at once.
+    """
+
+    def __init__(self, name: str, phase: Optional[str] = None) -> None:
+        """
+        Initializes the PerfSpan instance.
+
+        :param name: Name of the span, usually the qualified name of the timed method.
+        :param phase: Phase of the work, such as "compute" or "draw", or None.
+        """
+        self.name = name
+        self.phase = phase
+        self.fields = {}
+        self.parent = None
+        self.start = 0.0
+        self.child_seconds = 0.0
+        self.memory_start = 0
+        self.memory_peak = 0
+
+    def __enter__(self) -> 'PerfSpan':
+        stack = PerfLog.stack()
+        self.parent = stack[-1] if stack else None
+        if PerfLog.memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent is not None:
+                self.parent.memory_peak = max(self.parent.memory_peak, peak)
+            tracemalloc.reset_peak()
+            self.memory_start = self.memory_peak = current
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, error_type, error, traceback) -> None:
+        duration = time.perf_counter() - self.start
+        record = {"time": round(time.time(), 3), "span": self.name, "phase": self.phase,
+                  "thread": threading.current_thread().name, "parent": self.parent and self.parent.name,
+                  "duration_ms": round(duration * 1000, 3), "self_ms": round((duration - self.child_seconds) * 1000, 3)}
+        if PerfLog.memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory_peak = max(self.memory_peak, peak)
+            record["memory_delta_kb"] = round((current - self.memory_start) / 1024, 1)
+            record["memory_peak_kb"] = round((self.memory_peak - self.memory_start) / 1024, 1)
+        if error_type is not None:
+            record["error"] = error_type.__name__
+        record.update(self.fields)
+        PerfLog.stack().pop()
+        if self.parent is not None:
+            self.parent.child_seconds += duration
+            self.parent.memory_peak = max(self.parent.memory_peak, self.memory_peak)
+        PerfLog.write(record)
+
+    def annotate(self, **fields) -> None:
+        """
+        Adds fields, such as a row count, to the record of the span.
+
+        :param fields: Fields of the record.
+        """
+        self.fields.update(fields)
+
+
+class NullSpan:
+    """
+    The span returned while the performance log is disabled, which records nothing.
+    """
+
+    def __enter__(self) -> 'NullSpan':
+        return self
+
+    def __exit__(self, error_type, error, traceback) -> None:
+        pass
+
+    def annotate(self, **fields) -> None:
+        pass
+
+
+class PerfLog:
+    """
+    Switchable timing instrumentation of the hot paths, written as JSON lines to a rotating log file.
+
+    The log is off unless ``enable`` is called or the STEAMLENS_PERF_LOG environment variable names the log file
+    when this module is imported. While it is off, a timed method costs one attribute check per call and ``span``
+    returns a shared NullSpan. Memory tracking uses tracemalloc, which slows down allocations while it is on; set
+    STEAMLENS_PERF_LOG_MEMORY to 0 to log durations only. Spawned worker processes inherit the environment variable
+    and must call ``disable`` when they start, so only the main process writes and rotates the log file.
+    """
+
+    ENVIRONMENT_VARIABLE = "STEAMLENS_PERF_LOG"
+    MEMORY_ENVIRONMENT_VARIABLE = "STEAMLENS_PERF_LOG_MEMORY"
+    DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+    DEFAULT_BACKUP_COUNT = 3
+    NULL_SPAN = NullSpan()
+
+    enabled = False
+    memory = False
+    logger = None
+    local = threading.local()
+    started_tracemalloc = False
+
+    @classmethod
+    def enable(cls, path: str, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT,
+               memory: bool = True) -> None:
+        """
+        Starts writing spans to a log file, replacing the previous log file if the log is already enabled.
+
+        :param path: Path of the log file.
+        :param max_bytes: Size at which the log file is rotated.
+        :param backup_count: Number of rotated log files kept.
+        :param memory: Whether to record the traced memory of every span.
+        """
+        import logging
+        from logging.handlers import RotatingFileHandler
+
+        cls.disable()
+        logger = logging.getLogger("steamlens.perf")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        cls.logger = logger
+        if memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                cls.started_tracemalloc = True
+        cls.memory = memory
+        cls.enabled = True
+
+    @classmethod
+    def disable(cls) -> None:
+        """
+        Stops writing spans and closes the log file.
+        """
+        cls.enabled = False
+        cls.memory = False
+        if cls.started_tracemalloc:
+            import tracemalloc
+            tracemalloc.stop()
+            cls.started_tracemalloc = False
+        if cls.logger is not None:
+            for handler in list(cls.logger.handlers):
+                cls.logger.removeHandler(handler)
+                handler.close()
+            cls.logger = None
+
+    @classmethod
+    def stack(cls) -> list[PerfSpan]:
+        """
+        Retrieves the spans open on the current thread.
+
+        :return: List of the open spans, innermost last.
+        """
+        if not hasattr(cls.local, "spans"):
+            cls.local.spans = []
+        return cls.local.spans
+
+    @classmethod
+    def write(cls, record: dict) -> None:
+        """
+        Writes a record to the log file.
+
+        :param record: JSON-serializable record.
+        """
+        import json
+
+        logger = cls.logger
+        if logger is not None:
+            logger.info(json.dumps(record, default=str))
+
+    @classmethod
+    def span(cls, name: str, phase: Optional[str] = None):
+        """
+        Retrieves a context manager timing a block of code.
+
+        :param name: Name of the span.
+        :param phase: Phase of the work, or None.
+        :return: A PerfSpan, or NULL_SPAN while the log is disabled.
+        """
+        return PerfSpan(name, phase) if cls.enabled else cls.NULL_SPAN
+
+    @classmethod
+    def annotate(cls, **fields) -> None:
+        """
+        Adds fields, such as a row count, to the innermost span open on the current thread.
+
+        :param fields: Fields of the record.
+        """
+        if cls.enabled:
+            stack = cls.stack()
+            if stack:
+                stack[-1].annotate(**fields)
+
+    @classmethod
+    def timed(cls, name: Optional[str] = None, phase: Optional[str] = None):
+        """
+        Decorates a function so every call is timed in a span.
+
+        :param name: Name of the span, by default the qualified name of the function.
+        :param phase: Phase of the work, or None.
+        :return: The decorator.
+        """
+        def decorator(function):
+            span_name = name or function.__qualname__
+
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not cls.enabled:
+                    return function(*args, **kwargs)
+                with PerfSpan(span_name, phase):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+if os.environ.get(PerfLog.ENVIRONMENT_VARIABLE):
+    PerfLog.enable(os.environ[PerfLog.ENVIRONMENT_VARIABLE],
+                   memory=os.environ.get(PerfLog.MEMORY_ENVIRONMENT_VARIABLE, "1") != "0")
@@ -81,3 +81,10 @@ class PriceDistMenu(tk.Frame):
             f"Maximum: {price_stats['max']:.2f}\n"
         )
         return descriptive_stats
+
+    def destroy(self) -> None:
+        """
+        Releases the graph figure and destroys the menu.
+        """
+        self.graph_controller.close_canvas()
+        super().destroy()
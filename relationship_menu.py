@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
 from graph_controller import GraphController
+from graph_worker import GraphWorker
 
 
 class RelationshipMenu(tk.Frame):
@@ -24,7 +25,10 @@ class RelationshipMenu(tk.Frame):
         self.column_left_selected.set("Price")
         self.column_right_selected = tk.StringVar()
         self.column_right_selected.set("User score")
+        self.log_scale_selected = tk.IntVar()
+        self.log_scale_selected.set(1)
         self.init_components()
+        self.graph_worker = GraphWorker(self)
 
     def init_components(self) -> None:
         """
@@ -51,8 +55,15 @@ class RelationshipMenu(tk.Frame):
         column_right_option.bind("<<ComboboxSelected>>", self.update_attributes)
         column_right_option.grid(row=0, column=3, **padding)
 
+        log_scale_checkbutton = tk.Checkbutton(relationship_frame, text="Log scale", variable=self.log_scale_selected,
+                                               command=self.update_attributes, background="#2A475E",
+                                               activebackground="#2A475E", foreground="white",
+                                               activeforeground="white", selectcolor="black", **option)
+        log_scale_checkbutton.grid(row=0, column=4, **padding)
+
         self.graph_widget = self.graph_controller.relationship_graph(self, self.column_left_selected.get(),
-                                                                     self.column_right_selected.get())
+                                                                     self.column_right_selected.get(),
+                                                                     log_scale=self.log_scale_selected.get())
         self.graph_widget.pack(side=tk.LEFT, **padding)
 
         self.stat_frame = tk.Frame(self, background="#2A475E")
@@ -62,39 +73,55 @@ class RelationshipMenu(tk.Frame):
                               background="#2A475E", **option)
         stat_label.pack(**padding)
 
-        self.descriptive_stats_label = tk.Label(self.stat_frame, text=self.get_descriptive_stats_text(),
+        self.descriptive_stats_label = tk.Label(self.stat_frame,
+                                                text=self.get_descriptive_stats_text(self.column_left_selected.get(),
+                                                                                     self.column_right_selected.get()),
                                                 foreground="white",
                                                 background="#2A475E", font=(self.font, 18), justify=tk.LEFT)
         self.descriptive_stats_label.pack(**padding)
 
     def update_attributes(self, *args) -> None:
         """
-        Updates the selected attributes and updates the graph and descriptive statistics label.
+        Updates the selected attributes and updates the graph and descriptive statistics label in place.
+
+        The data the graph draws and the statistics are computed on the graph worker and passed to the drawing once
+        they are ready.
         """
-        padding = {'padx': 15, 'pady': 10}
-        if self.graph_widget:
-            self.graph_widget.destroy()
-        self.graph_widget = self.graph_controller.relationship_graph(self, self.column_left_selected.get(),
-                                                                     self.column_right_selected.get())
-        self.graph_widget.pack(**padding)
+        left_col, right_col = self.column_left_selected.get(), self.column_right_selected.get()
+        log_scale = self.log_scale_selected.get()
 
-        if self.descriptive_stats_label:
-            self.descriptive_stats_label.destroy()
-        self.descriptive_stats_label = tk.Label(self.stat_frame, text=self.get_descriptive_stats_text(),
-                                                foreground="white",
-                                                background="#2A475E", font=(self.font, 18), justify=tk.LEFT)
-        self.descriptive_stats_label.pack(**padding)
+        def compute() -> tuple[tuple, str]:
+            return (self.graph_controller.relationship_graph_data(left_col, right_col),
+                    self.get_descriptive_stats_text(left_col, right_col))
+
+        def render(result: tuple[tuple, str]) -> None:
+            graph_data, stats_text = result
+            self.graph_controller.relationship_graph(self, left_col, right_col, log_scale=log_scale,
+                                                     graph_data=graph_data)
+            self.descriptive_stats_label.config(text=stats_text)
+
+        self.graph_worker.request(compute, render)
+
+    def destroy(self) -> None:
+        """
+        Releases the graph figure and destroys the menu.
+        """
+        self.graph_worker.cancel()
+        self.graph_controller.close_canvas()
+        super().destroy()
 
-    def get_descriptive_stats_text(self) -> str:
+    def get_descriptive_stats_text(self, left_col: str, right_col: str) -> str:
         """
         Retrieves the descriptive statistics text.
 
+        :param left_col: The column on the x-axis.
+        :param right_col: The column on the y-axis.
         :returns: The descriptive statistics text.
         """
-        x_statistics = self.graph_controller.get_descriptive_statistics(self.column_left_selected.get())
-        y_statistics = self.graph_controller.get_descriptive_statistics(self.column_right_selected.get())
+        x_statistics = self.graph_controller.get_descriptive_statistics(left_col)
+        y_statistics = self.graph_controller.get_descriptive_statistics(right_col)
         descriptive_stats = (
-            f"{self.column_left_selected.get()} Summary Statistics\n"
+            f"{left_col} Summary Statistics\n"
             f"Count: {x_statistics['count']}\n"
             f"Mean: {x_statistics['mean']:.2f}\n"
             f"Std Deviation: {x_statistics['std']:.2f}\n"
@@ -104,7 +131,7 @@ class RelationshipMenu(tk.Frame):
             f"75th Percentile: {x_statistics['75%']:.2f}\n"
             f"Maximum: {x_statistics['max']:.2f}\n\n"
 
-            f"{self.column_right_selected.get()} Summary Statistics\n"
+            f"{right_col} Summary Statistics\n"
             f"Count: {y_statistics['count']}\n"
             f"Mean: {y_statistics['mean']:.2f}\n"
             f"Std Deviation: {y_statistics['std']:.2f}\n"
@@ -33,3 +33,10 @@ class ReleasedYearMenu(tk.Frame):
 
         graph_widget = self.graph_controller.released_year_graph(self)
         graph_widget.pack(fill=tk.BOTH, expand=True, **padding)
+
+    def destroy(self) -> None:
+        """
+        Releases the graph figure and destroys the menu.
+        """
+        self.graph_controller.close_canvas()
+        super().destroy()
@@ -0,0 +1,223 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+DATA_FILE = "games.csv"
+
+
+class ReportRenderer:
+    """
+    Renders a pack of graphs to image files without Tk, spread over a pool of worker processes.
+
+    Every worker loads the data once from the snapshot of the data file, building only the loading stages the
+    charts of the pack need, and keeps a GraphController drawing on an Agg canvas. The snapshot is built first, in
+    a process of its own, if it is missing or out of date, and the run stops if it could not be written, so the
+    workers never parse the data file themselves.
+
+    A pack is a list of charts, each a dictionary with the ``graph`` to draw, one of GRAPHS, and the arguments of
+    its drawing method, such as ``left_col`` or ``group_by_col``. An argument given as a list expands into one
+    chart per value, over every combination of the listed values. An optional ``name`` is the file name of the
+    chart, formatted with its arguments, e.g. ``"means_{left_col}_{group_by_col}"``.
+    """
+
+    GRAPHS = ["price_dist", "released_year", "relationship", "dashboard"]
+    # Loading stage of the DataLoader every graph needs.
+    GRAPH_STAGES = {"price_dist": "data", "released_year": "statistics", "relationship": "data",
+                    "dashboard": "aggregates"}
+    DEFAULT_CHARTS = [
+        {"graph": "price_dist"},
+        {"graph": "released_year"},
+        {"graph": "relationship", "left_col": "Price",
+         "right_col": ["User score", "Positive", "Negative", "Recommendations"]},
+        {"graph": "dashboard", "left_col": ["Platform", "Categories", "Genres", "Tags"],
+         "right_col": ["Price", "User score", "Positive", "Recommendations"],
+         "group_by_col": ["None", "Platform", "Genres"]},
+    ]
+    # GraphController of the current worker process.
+    graph_controller = None
+
+    def __init__(self, data_file: str, output_dir: str, formats: list[str], dpi: int = 100,
+                 workers: Optional[int] = None) -> None:
+        """
+        Initializes the ReportRenderer instance.
+
+        :param data_file: Path to the data file.
+        :param output_dir: Directory the image files are written to.
+        :param formats: Image formats written for every chart, such as "png" or "svg".
+        :param dpi: Resolution of raster images.
+        :param workers: Number of worker processes, defaults to the number of CPUs.
+        """
+        self.data_file = data_file
+        self.output_dir = output_dir
+        self.formats = formats
+        self.dpi = dpi
+        self.workers = workers or os.cpu_count() or 1
+
+    @classmethod
+    def expand(cls, charts: list[dict]) -> list[tuple[str, dict, str]]:
+        """
+        Expands the charts whose arguments list several values into one chart per combination of values.
+
+        :param charts: The charts of the pack.
+        :return: List of the graph, arguments and file name of every chart.
+        :raises ValueError: If a chart has no graph or an unknown one.
+        """
+        expanded = []
+        for chart in charts:
+            arguments = dict(chart)
+            graph = arguments.pop("graph", None)
+            if graph not in cls.GRAPHS:
+                raise ValueError(f"unknown graph {graph!r} in {chart}, expected one of {', '.join(cls.GRAPHS)}")
+            name = arguments.pop("name", None)
+            values = [value if isinstance(value, list) else [value] for value in arguments.values()]
+            for combination in itertools.product(*values):
+                chart_arguments = dict(zip(arguments, combination))
+                file_name = name.format(**chart_arguments) if name else "_".join(map(str, [graph, *combination]))
+                expanded.append((graph, chart_arguments, re.sub(r"[^\w.-]+", "_", file_name)))
+        return expanded
+
+    @staticmethod
+    def has_snapshot(data_file: str) -> bool:
+        """
+        Checks whether the data file has an up to date snapshot.
+
+        :param data_file: Path to the data file.
+        :return: True if the snapshot matches the data file, False otherwise.
+        """
+        from snapshot_cache import SnapshotCache
+
+        snapshot = SnapshotCache(data_file)
+        manifest = snapshot.read_manifest()
+        return manifest is not None and snapshot.is_valid(manifest)
+
+    @classmethod
+    def build_snapshot(cls, data_file: str) -> None:
+        """
+        Writes the snapshot of the data file if it is missing or out of date.
+
+        :param data_file: Path to the data file.
+        """
+        from data_loader import DataLoader
+
+        if not cls.has_snapshot(data_file):
+            DataLoader(data_file, stages=["data"])
+
+    @classmethod
+    def init_worker(cls, data_file: str, stages: list[str]) -> None:
+        """
+        Loads the data in a worker process.
+
+        The worker parses the data file in its own process if the snapshot turns out to be out of date, and does not
+        write to the performance log, which is left to one process.
+
+        :param data_file: Path to the data file.
+        :param stages: Loading stages of the DataLoader to run.
+        """
+        import matplotlib
+        from data_loader import DataLoader
+        from graph_controller import GraphController
+        from perf_log import PerfLog
+
+        PerfLog.disable()
+        matplotlib.use("Agg")
+        DataLoader.preprocess_workers = 1
+        DataLoader(data_file, stages=stages)
+        cls.graph_controller = GraphController()
+
+    @classmethod
+    def render(cls, graph: str, arguments: dict, path: str, formats: list[str], dpi: int) -> list[str]:
+        """
+        Draws one chart in a worker process and saves it in every format.
+
+        :param graph: The graph to draw, one of GRAPHS.
+        :param arguments: Arguments of the drawing method besides the parent.
+        :param path: Path of the image files without extension.
+        :param formats: Image formats to save.
+        :param dpi: Resolution of raster images.
+        :return: List of the paths of the saved files.
+        """
+        graph_controller = cls.graph_controller
+        graph_controller.close_canvas()
+        try:
+            figure = getattr(graph_controller, f"{graph}_graph")(None, **arguments)
+            paths = [f"{path}.{image_format}" for image_format in formats]
+            for image_path in paths:
+                figure.savefig(image_path, dpi=dpi)
+            return paths
+        finally:
+            graph_controller.close_canvas()
+
+    def run(self, charts: list[dict]) -> bool:
+        """
+        Renders every chart of a pack.
+
+        :param charts: The charts of the pack.
+        :return: True if every chart was rendered, False otherwise.
+        """
+        try:
+            expanded = self.expand(charts)
+        except ValueError as error:
+            print(f"Error: {error}")
+            return False
+        if not os.path.exists(self.data_file):
+            print(f"Error: data file {self.data_file} not found.")
+            return False
+        os.makedirs(self.output_dir, exist_ok=True)
+        context = multiprocessing.get_context("spawn")
+        failures = 0
+        try:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                executor.submit(self.build_snapshot, self.data_file).result()
+        except (BrokenProcessPool, OSError, KeyError, ValueError) as error:
+            print(f"Error: could not build the snapshot of {self.data_file} ({error!r}).")
+            return False
+        if not self.has_snapshot(self.data_file):
+            print(f"Error: could not write the snapshot of {self.data_file}, every worker would parse it again.")
+            return False
+        stages = sorted({self.GRAPH_STAGES[graph] for graph, _, _ in expanded})
+        try:
+            with ProcessPoolExecutor(min(self.workers, len(expanded)) or 1, mp_context=context,
+                                     initializer=self.init_worker, initargs=(self.data_file, stages)) as executor:
+                futures = {executor.submit(self.render, graph, arguments, os.path.join(self.output_dir, file_name),
+                                           self.formats, self.dpi): file_name
+                           for graph, arguments, file_name in expanded}
+                for future in as_completed(futures):
+                    try:
+                        print(f"Rendered {', '.join(future.result())}")
+                    except (TypeError, KeyError, ValueError) as error:
+                        failures += 1
+                        print(f"Error: could not render {futures[future]} ({error!r}).")
+        except BrokenProcessPool as error:
+            print(f"Error: a worker process failed while loading {self.data_file} ({error}).")
+            return False
+        print(f"{len(expanded) - failures} of {len(expanded)} charts written to {self.output_dir}")
+        return failures == 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render SteamLens graphs to image files without the GUI.")
+    parser.add_argument("--charts", help="JSON file with the list of charts (default: the built-in pack)")
+    parser.add_argument("--data", default=DATA_FILE, help=f"data file (default: {DATA_FILE})")
+    parser.add_argument("--output-dir", default="report", help="directory of the image files (default: report)")
+    parser.add_argument("--formats", nargs="+", default=["png"], help="image formats (default: png)")
+    parser.add_argument("--dpi", type=int, default=100, help="resolution of raster images (default: 100)")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: number of CPUs)")
+    arguments = parser.parse_args()
+    chart_pack = ReportRenderer.DEFAULT_CHARTS
+    if arguments.charts:
+        try:
+            with open(arguments.charts, encoding="utf-8") as file:
+                chart_pack = json.load(file)
+        except (OSError, ValueError) as error:
+            print(f"Error: could not read {arguments.charts} ({error}).")
+            sys.exit(1)
+    renderer = ReportRenderer(arguments.data, arguments.output_dir, arguments.formats, arguments.dpi,
+                              arguments.workers)
+    sys.exit(0 if renderer.run(chart_pack) else 1)
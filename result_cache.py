@@ -0,0 +1,108 @@
+import hashlib
+import sys
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+
+class ResultCache:
+    """
+    A least recently used cache of computed results, bounded by the total size of the results in bytes.
+
+    The cache is thread safe and counts hits, misses and evictions so its size can be tuned.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initializes the ResultCache instance.
+
+        :param max_bytes: Maximum total size of the cached results.
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()
+
+    @staticmethod
+    def size_of(value) -> int:
+        """
+        Estimates the memory used by a result.
+
+        :param value: Array, DataFrame, Series, container of them or any other object.
+        :return: Size in bytes.
+        """
+        if hasattr(value, "memory_usage"):
+            usage = value.memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+        if hasattr(value, "nbytes"):
+            return int(value.nbytes)
+        if isinstance(value, (tuple, list)):
+            return sys.getsizeof(value) + sum(ResultCache.size_of(item) for item in value)
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(ResultCache.size_of(item) for item in value.values())
+        return sys.getsizeof(value)
+
+    @staticmethod
+    def fingerprint(rows) -> Optional[tuple]:
+        """
+        Summarizes a selection of row positions for use in a cache key.
+
+        :param rows: Array of row positions, or None.
+        :return: Tuple of the selection length and a digest of its contents, or None if rows is None.
+        """
+        if rows is None:
+            return None
+        return len(rows), hashlib.blake2b(rows.tobytes(), digest_size=16).hexdigest()
+
+    def get_or_compute(self, key, compute):
+        """
+        Retrieves a cached result, computing and storing it on a miss.
+
+        Results larger than max_bytes are returned without being stored.
+
+        :param key: Hashable key identifying the result.
+        :param compute: Function called without arguments to compute the result.
+        :return: The result.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+        value = compute()
+        size = self.size_of(value)
+        with self.lock:
+            if size > self.max_bytes or key in self.entries:
+                return value
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """
+        Removes every cached result, keeping the counters.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        Retrieves the cache counters.
+
+        :return: Dictionary of the hits, misses, evictions, number of entries and total size in bytes.
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self.entries), "bytes": self.total_bytes}
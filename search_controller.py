@@ -1,4 +1,8 @@
+from functools import reduce
+from typing import Optional
 from data_loader import DataLoader
+from perf_log import PerfLog
+import numpy as np
 import pandas as pd
 
 
@@ -7,6 +11,8 @@ class SearchController:
     Controller class responsible for handling search operations.
     """
 
+    TOP_ROWS_CHUNK_SIZE = 1 << 16
+
     def __init__(self) -> None:
         """
         Initializes the SearchController instance.
@@ -56,6 +62,20 @@ class SearchController:
 
         return self.data_loader.sorting_attributes
 
+    def get_rows_values(self, rows: np.ndarray) -> list[list]:
+        """
+        Retrieves the column values of the given rows.
+        Narrow float columns are converted through their shortest text form, so a price of 4.99 is not shown
+        as its float64 widening 4.989999771118164.
+        :param rows: Array of row positions.
+        :return: List of the values of every row, in the order of the data columns.
+        """
+        data = self.get_data().iloc[rows][self.get_data_columns()]
+        for column in data.select_dtypes("float32").columns:
+            data[column] = data[column].astype(str).astype(float)
+        return data.to_numpy().tolist()
+
+    @PerfLog.timed()
     def search_data(self, search_entry: str, selected_category: str, selected_genre: str,
                     selected_tag: str, selected_windows: int, selected_mac: int, selected_linux: int) -> pd.DataFrame:
         """
@@ -69,20 +89,74 @@ class SearchController:
         :param selected_linux: Flag indicating if Linux platform is selected.
         :return: DataFrame containing the search results.
         """
-        search_name = self.get_data()["Name"].str.contains(search_entry, case=False, na=False, regex=False)
-        search_dev = self.get_data()["Developers"].str.contains(search_entry, case=False, na=False, regex=False)
-        search_pub = self.get_data()["Publishers"].str.contains(search_entry, case=False, na=False, regex=False)
+        results = self.get_data().iloc[self.search_rows(search_entry, selected_category, selected_genre, selected_tag,
+                                                        selected_windows, selected_mac, selected_linux)]
+        PerfLog.annotate(rows=len(results))
+        return results
+
+    @PerfLog.timed()
+    def search_rows(self, search_entry: str, selected_category: str, selected_genre: str,
+                    selected_tag: str, selected_windows: int, selected_mac: int, selected_linux: int) -> np.ndarray:
+        """
+        Finds the rows matching the provided search parameters.
+        :param search_entry: String to search for in the data.
+        :param selected_category: Selected category for filtering.
+        :param selected_genre: Selected genre for filtering.
+        :param selected_tag: Selected tag for filtering.
+        :param selected_windows: Flag indicating if Windows platform is selected.
+        :param selected_mac: Flag indicating if Mac platform is selected.
+        :param selected_linux: Flag indicating if Linux platform is selected.
+        :return: Sorted array of the row positions of the search results.
+        """
+        rows = None
+        for column, token in (("Categories", selected_category), ("Genres", selected_genre), ("Tags", selected_tag)):
+            if token != "None":
+                token_rows = self.data_loader.token_indexes[column].rows(token)
+                rows = token_rows if rows is None else np.intersect1d(rows, token_rows, assume_unique=True)
+
+        if search_entry:
+            text_rows = reduce(np.union1d, [index.search(search_entry)
+                                            for index in self.data_loader.text_indexes.values()])
+            rows = text_rows if rows is None else np.intersect1d(rows, text_rows, assume_unique=True)
+
+        platform = DataLoader.platform_bits(selected_windows, selected_mac, selected_linux)
+        if platform:
+            platform_mask = self.data_loader.platform_mask
+            matches = ((platform_mask if rows is None else platform_mask[rows]) & platform) == platform
+            rows = np.flatnonzero(matches) if rows is None else rows[matches]
+
+        rows = np.arange(len(self.get_data())) if rows is None else rows
+        PerfLog.annotate(rows=len(rows))
+        return rows
+
+    @PerfLog.timed()
+    def top_rows(self, rows: np.ndarray, attribute: str, descending: bool = False,
+                 limit: Optional[int] = None) -> np.ndarray:
+        """
+        Orders rows by an attribute by walking the presorted order of that attribute.
 
-        search_result = self.get_data()[search_name | search_dev | search_pub]
-        search_result = search_result.loc[search_result["Linux"]] if selected_linux else search_result
-        search_result = search_result.loc[search_result["Mac"]] if selected_mac else search_result
-        search_result = search_result.loc[search_result["Windows"]] if selected_windows else search_result
+        The walk stops as soon as ``limit`` rows are found, so neither the rows nor their values are sorted.
 
-        search_result = search_result[search_result["Categories"].str.contains(selected_category, na=False)] \
-            if selected_category != "None" else search_result
-        search_result = search_result[search_result["Genres"].str.contains(selected_genre, na=False)] \
-            if selected_genre != "None" else search_result
-        search_result = search_result[search_result["Tags"].str.contains(selected_tag, na=False)] \
-            if selected_tag != "None" else search_result
+        :param rows: Row positions to order.
+        :param attribute: The sorting attribute.
+        :param descending: Whether to order from the largest value.
+        :param limit: Maximum number of rows to return, or None for all of them.
+        :return: Array of row positions in sorted order.
+        """
+        order = self.data_loader.sort_orders[attribute]
+        if descending:
+            order = order[::-1]
+        selected = np.zeros(len(order), dtype=bool)
+        selected[rows] = True
+        if limit is None:
+            return order[selected[order]]
 
-        return search_result
+        found = []
+        count = 0
+        for start in range(0, len(order), self.TOP_ROWS_CHUNK_SIZE):
+            chunk = order[start:start + self.TOP_ROWS_CHUNK_SIZE]
+            found.append(chunk[selected[chunk]])
+            count += len(found[-1])
+            if count >= limit:
+                break
+        return np.concatenate(found)[:limit] if found else order[:0]
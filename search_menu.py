@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
-import pandas as pd
+import numpy as np
+from perf_log import PerfLog
 from search_controller import SearchController
 from search_bar import SearchBar
-from threading import Thread
+from virtual_table import VirtualTable
 
 
 class SearchMenu(tk.Frame):
@@ -38,6 +39,8 @@ class SearchMenu(tk.Frame):
         self.descending_selected = tk.IntVar()
         self.search_entry.set("Search game...")
         self.search_controller = SearchController()
+        # Row ids of the selected games in the order they were selected, a dict used as an ordered set.
+        self.selected_rows = {}
         self.init_components()
 
     def init_components(self) -> None:
@@ -49,7 +52,10 @@ class SearchMenu(tk.Frame):
         self.search_frame_option(option, padding)
         self.games_library_table_option(option, padding)
         self.selected_games_table_option(option, padding)
-        self.insight_button = tk.Button(self, text="Compare", font=(self.font, 12), command=self.compare_games)
+        # The dashboard needs the aggregates, which are built after the search indexes.
+        compare_state = tk.NORMAL if self.parent.is_menu_ready("dashboard_menu") else tk.DISABLED
+        self.insight_button = tk.Button(self, text="Compare", font=(self.font, 12), command=self.compare_games,
+                                        state=compare_state)
         self.insight_button.bind("<Return>", self.compare_games)
         self.insight_button.pack(pady=10)
 
@@ -153,20 +159,27 @@ class SearchMenu(tk.Frame):
         else:
             self.descending_checkbutton.config(state=tk.NORMAL)
 
-    def compare_games(self) -> None:
+    def enable_menu(self, attribute: str) -> None:
         """
-        Compares the selected games.
+        Enables the controls leading to a menu once the menu is ready.
+
+        :param attribute: Name of the SteamLensUI attribute holding the menu.
+        """
+        if attribute == "dashboard_menu":
+            self.insight_button.config(state=tk.NORMAL)
+
+    def compare_games(self, *args) -> None:
+        """
+        Compares the selected games in the dashboard, once the dashboard is ready.
         """
-        selected_games = [self.selected_games_table.item(item)['values']
-                          for item in self.selected_games_table.get_children()]
-        if not selected_games:
+        if not self.parent.is_menu_ready("dashboard_menu"):
+            return
+        selected_rows = np.fromiter(self.selected_rows, dtype=np.int64, count=len(self.selected_rows))
+        if not len(selected_rows):
             messagebox.showwarning("Warning", "You must select any game to compare them.")
             return
 
-        selected_games_df = pd.DataFrame(selected_games, columns=self.search_controller.get_data_columns())
-        for column in self.search_controller.get_sorting_attributes()[1:]:
-            selected_games_df[column] = selected_games_df[column].astype(float)
-        self.parent.dashboard_menu.graph_controller.selected_games = selected_games_df
+        self.parent.dashboard_menu.graph_controller.selected_games = selected_rows
         self.parent.dashboard_menu.update_graph()
         self.parent.change_to_menu(self.parent.dashboard_menu)
 
@@ -189,22 +202,13 @@ class SearchMenu(tk.Frame):
         :param option: Dictionary containing font settings for widget configuration.
         :param padding: Dictionary containing padding values.
         """
-        library_text = tk.Label(self, text="Game library", foreground="white", background="#2A475E", **option)
-        library_text.pack(ipady=10, **padding)
-
-        self.games_library_table = ttk.Treeview(self, columns=self.search_controller.get_data_columns(),
-                                                selectmode="browse", show="headings", height=5)
-        for column in self.search_controller.get_data_columns():
-            self.games_library_table.column(column, width=80)
-            self.games_library_table.heading(column, text=column)
-
-        self.games_library_table.bind("<Double-Button-1>", func=self.insert_selected_game)
-        self.games_library_table.pack(padx=40)
+        self.library_text = tk.Label(self, text="Game library", foreground="white", background="#2A475E", **option)
+        self.library_text.pack(ipady=10, **padding)
 
-        library_scrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.games_library_table.xview)
-        library_scrollbar.pack(fill=tk.BOTH, expand=True, padx=40)
-
-        self.games_library_table.config(xscrollcommand=library_scrollbar.set)
+        self.games_library_table = VirtualTable(self, self.search_controller.get_data_columns(),
+                                                self.search_controller.get_rows_values, height=5)
+        self.games_library_table.tree.bind("<Double-Button-1>", func=self.insert_selected_game)
+        self.games_library_table.pack(fill=tk.X, padx=40)
 
     def selected_games_table_option(self, option, padding) -> None:
         """
@@ -234,15 +238,16 @@ class SearchMenu(tk.Frame):
 
         self.selected_games_table.config(xscrollcommand=selected_games_scrollbar.set)
 
-    def insert_search_result(self, search_results) -> None:
+    @PerfLog.timed(phase="draw")
+    def insert_search_result(self, search_rows) -> None:
         """
-        Inserts search results into the game library table.
+        Shows search results in the game library table.
 
-        :param search_results: List of search results.
+        :param search_rows: Array of the row ids of the search results, in display order.
         """
-        self.games_library_table.delete(*self.games_library_table.get_children())
-        [self.games_library_table.insert('', 'end', iid=result[0], values=result)
-         for result in search_results]
+        PerfLog.annotate(rows=len(search_rows))
+        self.library_text.config(text=f"Game library ({len(search_rows)} games)")
+        self.games_library_table.set_rows(search_rows)
 
     def search(self, *args) -> None:
         """
@@ -253,7 +258,7 @@ class SearchMenu(tk.Frame):
         else:
             search_entry = self.search_entry.get()
             self.search_bar.config(foreground="black")
-        search_result = self.search_controller.search_data(
+        search_rows = self.search_controller.search_rows(
             search_entry,
             self.category_selected.get(),
             self.genre_selected.get(),
@@ -263,32 +268,26 @@ class SearchMenu(tk.Frame):
             self.linux_selected.get(),
         )
 
-        if self.sorted_attribute_selected.get() == "None":
-            sorting_thread = Thread(target=lambda: self.insert_search_result(search_result.to_numpy().tolist()[:100]))
-            sorting_thread.start()
-        else:
-            if self.descending_selected.get():
-                sorting_thread = Thread(target=lambda: self.insert_search_result(
-                    search_result.sort_values(self.sorted_attribute_selected.get(), ascending=False).
-                    to_numpy().tolist()[:100]
-                ))
-                sorting_thread.start()
-            else:
-                sorting_thread = Thread(target=lambda: self.insert_search_result(
-                    search_result.sort_values(self.sorted_attribute_selected.get()).
-                    to_numpy().tolist()[:100]
-                ))
-                sorting_thread.start()
+        if self.sorted_attribute_selected.get() != "None":
+            search_rows = self.search_controller.top_rows(search_rows, self.sorted_attribute_selected.get(),
+                                                          descending=self.descending_selected.get())
+        self.insert_search_result(search_rows)
 
     def insert_selected_game(self, *args) -> None:
         """
-        Inserts the selected game into the selected games table.
+        Inserts the selected game into the selected games table, using its row position as the item id.
         """
-        selected_game = self.games_library_table.item(self.games_library_table.focus())['values']
-        if self.check_duplicate(selected_game):
+        selected_row = self.games_library_table.focused_row()
+        if selected_row is None:
+            return
+        selected_row = int(selected_row)
+        if self.check_duplicate(selected_row):
             messagebox.showwarning("Warning", "You cannot select the same game twice.")
-        else:
-            self.selected_games_table.insert('', 'end', values=selected_game)
+            return
+        selected_game = self.games_library_table.focused_values()
+        if selected_game:
+            self.selected_rows[selected_row] = None
+            self.selected_games_table.insert('', 'end', iid=str(selected_row), values=selected_game)
 
     def deselect_game(self, *args) -> None:
         """
@@ -296,20 +295,17 @@ class SearchMenu(tk.Frame):
         """
 
         try:
-            self.selected_games_table.delete(self.selected_games_table.selection()[0])
+            item = self.selected_games_table.selection()[0]
         except IndexError:
-            pass
+            return
+        self.selected_games_table.delete(item)
+        self.selected_rows.pop(int(item), None)
 
-    def check_duplicate(self, selected_game) -> bool:
+    def check_duplicate(self, selected_row: int) -> bool:
         """
-        Checks if the selected game is already present in the selected games table.
+        Checks if a game is already present in the selected games table.
 
-        :param selected_game: The selected game.
+        :param selected_row: The row id of the game.
         :return: True if the game is already present, False otherwise.
         """
-        selected_game_title = selected_game[0]
-        for child in self.selected_games_table.get_children():
-            values = self.selected_games_table.item(child)['values']
-            if values and values[0] == selected_game_title:
-                return True
-        return False
+        return selected_row in self.selected_rows
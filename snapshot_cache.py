@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+class SnapshotCache:
+    """
+    A columnar on-disk snapshot of a preprocessed DataFrame, keyed by the file it was built from.
+
+    Every column is stored as raw ``.npy`` arrays next to a JSON manifest. Numeric and boolean
+    columns are memory-mapped on load, text columns are stored as one NUL-separated UTF-8 blob
+    plus a null mask. The manifest also lists the delta files applied to the data since it was built from the
+    source file.
+    """
+
+    VERSION = 5
+    MANIFEST_FILE = "manifest.json"
+    HASH_BLOCK_SIZE = 1 << 20
+    TEXT_SEPARATOR = "\x00"
+
+    def __init__(self, source_file: str, snapshot_dir: Optional[str] = None) -> None:
+        """
+        Initializes the SnapshotCache instance.
+
+        :param source_file: Path to the file the snapshot is built from.
+        :param snapshot_dir: Directory holding the snapshot, defaults to ``<source name>_snapshot``.
+        """
+        self.source_file = source_file
+        self.snapshot_dir = snapshot_dir or os.path.splitext(source_file)[0] + "_snapshot"
+        # Signature of the source file and delta files applied to the stored data, as written to the manifest.
+        self.source = None
+        self.deltas = []
+
+    @property
+    def manifest_path(self) -> str:
+        """
+        Retrieves the path of the snapshot manifest.
+
+        :return: Path to the manifest file.
+        """
+        return os.path.join(self.snapshot_dir, self.MANIFEST_FILE)
+
+    def source_signature(self, with_hash: bool = True) -> dict:
+        """
+        Describes the current state of the source file.
+
+        :param with_hash: Whether to include the SHA-256 hash of the file content.
+        :return: Dictionary with the size, modification time and optionally the content hash.
+        """
+        stat = os.stat(self.source_file)
+        signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if with_hash:
+            signature["sha256"] = self.hash_file(self.source_file)
+        return signature
+
+    @classmethod
+    def hash_file(cls, path: str) -> str:
+        """
+        Computes the SHA-256 hash of a file without reading it into memory at once.
+
+        :param path: Path to the file.
+        :return: Hex digest of the file content.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(cls.HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def read_manifest(self) -> Optional[dict]:
+        """
+        Reads the snapshot manifest.
+
+        :return: The manifest, or None if it is missing, unreadable, incomplete or from another snapshot version.
+        """
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(manifest, dict) or manifest.get("version") != self.VERSION:
+            return None
+        if not self.is_complete(manifest):
+            print(f"Warning: snapshot manifest {self.manifest_path} is incomplete, rebuilding.")
+            return None
+        return manifest
+
+    @staticmethod
+    def is_complete(manifest: dict) -> bool:
+        """
+        Checks whether a manifest has every entry the snapshot is loaded with, with the expected types.
+
+        :param manifest: The manifest to check.
+        :return: True if the manifest is complete, False if an entry is missing or has the wrong type.
+        """
+        source, columns = manifest.get("source"), manifest.get("columns")
+        if not isinstance(source, dict) or not isinstance(columns, list):
+            return False
+        if not isinstance(manifest.get("index"), str) or not isinstance(manifest.get("deltas", []), list):
+            return False
+        if not all(isinstance(source.get(key), int) for key in ["size", "mtime_ns"]):
+            return False
+        if not isinstance(source.get("sha256"), str):
+            return False
+        return all(isinstance(column, dict) and all(isinstance(column.get(key), str)
+                                                    for key in ["name", "file", "dtype", "kind"])
+                   for column in columns)
+
+    def write_manifest(self, manifest: dict, directory: Optional[str] = None) -> None:
+        """
+        Writes the snapshot manifest.
+
+        :param manifest: The manifest to write.
+        :param directory: Directory to write into, defaults to the snapshot directory.
+        """
+        with open(os.path.join(directory or self.snapshot_dir, self.MANIFEST_FILE), "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=1)
+
+    def is_valid(self, manifest: dict) -> bool:
+        """
+        Checks whether a snapshot still matches its source file.
+
+        The size and modification time are compared first, the content hash is only computed
+        when the file was touched, so an unchanged source costs a single ``stat`` call.
+
+        :param manifest: The manifest of the snapshot.
+        :return: True if the snapshot was built from the current source content, False otherwise.
+        """
+        try:
+            signature = self.source_signature(with_hash=False)
+        except OSError:
+            return False
+        source = manifest["source"]
+        if signature["size"] != source["size"]:
+            return False
+        if signature["mtime_ns"] == source["mtime_ns"]:
+            return True
+        if self.hash_file(self.source_file) != source["sha256"]:
+            return False
+        source["mtime_ns"] = signature["mtime_ns"]
+        try:
+            self.write_manifest(manifest)
+        except OSError:
+            pass
+        return True
+
+    def load(self) -> Optional[pd.DataFrame]:
+        """
+        Loads the snapshot if it is up to date with its source file.
+
+        :return: DataFrame stored in the snapshot, or None if there is no valid snapshot.
+        """
+        manifest = self.read_manifest()
+        if manifest is None or not self.is_valid(manifest):
+            return None
+        try:
+            columns = {column["name"]: self.load_column(column) for column in manifest["columns"]}
+            index = np.load(os.path.join(self.snapshot_dir, manifest["index"]), mmap_mode="c")
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            print(f"Warning: snapshot {self.snapshot_dir} is unreadable ({error}), rebuilding.")
+            return None
+        data = pd.DataFrame(columns, copy=False)
+        data.index = index
+        self.source = manifest["source"]
+        self.deltas = manifest.get("deltas", [])
+        return data
+
+    def save(self, data: pd.DataFrame, deltas: Optional[list[dict]] = None) -> None:
+        """
+        Saves a DataFrame as the snapshot of the current source file.
+
+        The snapshot is written to a temporary directory first and swapped in when complete. When deltas are given,
+        the data still derives from the source file the snapshot was loaded or saved with, so its signature is
+        reused instead of hashing the file again.
+
+        :param data: The DataFrame to store.
+        :param deltas: Descriptions of the delta files applied to the data, or None if it matches the source file.
+        """
+        temp_dir = self.snapshot_dir + ".tmp"
+        try:
+            signature = self.source if deltas and self.source is not None else self.source_signature()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            os.makedirs(temp_dir)
+            columns = [self.save_column(temp_dir, f"col_{number:03d}", name, data[name])
+                       for number, name in enumerate(data.columns)]
+            np.save(os.path.join(temp_dir, "index.npy"), data.index.to_numpy())
+            manifest = {"version": self.VERSION, "source": signature, "rows": len(data),
+                        "index": "index.npy", "columns": columns, "deltas": deltas or []}
+            self.write_manifest(manifest, temp_dir)
+            shutil.rmtree(self.snapshot_dir, ignore_errors=True)
+            os.replace(temp_dir, self.snapshot_dir)
+            self.source, self.deltas = signature, manifest["deltas"]
+        except (OSError, TypeError, ValueError) as error:
+            print(f"Warning: could not write snapshot {self.snapshot_dir} ({error}).")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @classmethod
+    def save_column(cls, directory: str, file_name: str, name: str, column: pd.Series) -> dict:
+        """
+        Saves a single column as ``.npy`` arrays.
+
+        :param directory: Directory to write into.
+        :param file_name: Base file name of the column arrays.
+        :param name: Name of the column.
+        :param column: The column to store.
+        :return: Manifest entry describing the stored column.
+        :raises TypeError: If a text column holds values that are not strings.
+        :raises ValueError: If a text value contains the separator character.
+        """
+        entry = {"name": name, "file": file_name, "dtype": str(column.dtype)}
+        path = os.path.join(directory, file_name)
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            entry["kind"] = "category"
+            np.save(path + ".npy", column.cat.codes.to_numpy())
+            cls.save_text(path + ".categories", pd.Series(column.cat.categories))
+        elif column.dtype.kind in "biuf":
+            entry["kind"] = "array"
+            np.save(path + ".npy", column.to_numpy())
+        else:
+            entry["kind"] = "text"
+            cls.save_text(path, column)
+        return entry
+
+    @classmethod
+    def save_text(cls, path: str, column: pd.Series) -> None:
+        """
+        Saves text values as one separated UTF-8 blob and a null mask.
+
+        :param path: Base path of the files to write.
+        :param column: The text values to store.
+        :raises TypeError: If the column holds values that are not strings.
+        :raises ValueError: If a value contains the separator character.
+        """
+        nulls = column.isna().to_numpy()
+        text = cls.TEXT_SEPARATOR.join(column.astype(object).where(~nulls, "").tolist())
+        if text.count(cls.TEXT_SEPARATOR) != max(len(column) - 1, 0):
+            raise ValueError(f"{path} contains the text separator")
+        np.save(path + ".nulls.npy", nulls)
+        with open(path + ".txt", "wb") as file:
+            file.write(text.encode("utf-8", "surrogatepass"))
+
+    def load_column(self, entry: dict) -> pd.Series:
+        """
+        Loads a single column stored by ``save_column``.
+
+        :param entry: Manifest entry describing the stored column.
+        :return: Series holding the column values, memory-mapped for numeric and boolean columns.
+        """
+        path = os.path.join(self.snapshot_dir, entry["file"])
+        if entry["kind"] == "category":
+            categories = self.load_text(path + ".categories")
+            codes = np.load(path + ".npy", mmap_mode="c")
+            return pd.Series(pd.Categorical.from_codes(codes, categories=categories), copy=False)
+        if entry["kind"] == "array":
+            return pd.Series(np.load(path + ".npy", mmap_mode="c"), copy=False)
+        return pd.Series(self.load_text(path), dtype=entry["dtype"])
+
+    def load_text(self, path: str) -> np.ndarray:
+        """
+        Loads text values stored by ``save_text``.
+
+        :param path: Base path of the stored files.
+        :return: Object array of strings, with None for missing values.
+        """
+        nulls = np.load(path + ".nulls.npy")
+        with open(path + ".txt", "rb") as file:
+            text = file.read().decode("utf-8", "surrogatepass")
+        values = np.empty(len(nulls), dtype=object)
+        if len(nulls):
+            values[:] = text.split(self.TEXT_SEPARATOR)
+        values[nulls] = None
+        return values
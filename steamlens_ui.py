@@ -1,15 +1,23 @@
+import importlib
 import tkinter as tk
+from typing import TYPE_CHECKING, Optional
+from data_loader import DataLoader
 from home_menu import HomeMenu
-from search_menu import SearchMenu
-from price_dist_menu import PriceDistMenu
-from released_year_menu import ReleasedYearMenu
-from relationship_menu import RelationshipMenu
-from dashboard_menu import DashboardMenu
+
+if TYPE_CHECKING:
+    from search_menu import SearchMenu
+    from price_dist_menu import PriceDistMenu
+    from released_year_menu import ReleasedYearMenu
+    from relationship_menu import RelationshipMenu
+    from dashboard_menu import DashboardMenu
 
 
 class SteamLensUI(tk.Tk):
     """
     Graphical user interface for the SteamLens application.
+
+    The menu modules are imported when their menu is first created, so pandas, numpy and matplotlib are not
+    loaded before the window is shown.
     """
 
     def __init__(self) -> None:
@@ -21,18 +29,23 @@ class SteamLensUI(tk.Tk):
         self.config(background="#2A475E")
         self.geometry("1280x720")
         self.font = "Segoe UI"
+        self.data_loader = DataLoader.get_instance()
 
         self.home_menu = HomeMenu(self, self.font)
-        self.search_menu = SearchMenu(self, self.font)
-        self.price_dist_menu = PriceDistMenu(self, self.font)
-        self.released_year_menu = ReleasedYearMenu(self, self.font)
-        self.relationship_menu = RelationshipMenu(self, self.font)
-        self.dashboard_menu = DashboardMenu(self, self.font)
-
-        self.menus = [self.home_menu, self.search_menu, self.price_dist_menu, self.released_year_menu,
-                      self.relationship_menu, self.dashboard_menu]
+        self.menus = {"home_menu": self.home_menu}
+        self.menu_factories = {"search_menu": ("SearchMenu", "search"),
+                               "price_dist_menu": ("PriceDistMenu", "statistics"),
+                               "released_year_menu": ("ReleasedYearMenu", "statistics"),
+                               "relationship_menu": ("RelationshipMenu", "statistics"),
+                               "dashboard_menu": ("DashboardMenu", "aggregates")}
+        self.menu_labels = {"search_menu": "Search", "price_dist_menu": "Prices Distribution",
+                            "released_year_menu": "Release Year", "relationship_menu": "Relationship",
+                            "dashboard_menu": "Games Insights Dashboard"}
+        self.pending_menus = list(self.menu_factories)
+        self.prefetch_menu = "search_menu"
 
         self.init_components()
+        self.check_loading()
 
     def init_components(self) -> None:
         """
@@ -47,18 +60,12 @@ class SteamLensUI(tk.Tk):
         menu_choice.add_command(label="Home",
                                 command=lambda: self.change_to_menu(self.home_menu))
         menu_choice.add_separator()
-        menu_choice.add_command(label="Search",
-                                command=lambda: self.change_to_menu(self.search_menu))
-        menu_choice.add_command(label="Prices Distribution",
-                                command=lambda: self.change_to_menu(self.price_dist_menu))
-        menu_choice.add_command(label="Release Year",
-                                command=lambda: self.change_to_menu(self.released_year_menu))
-        menu_choice.add_command(label="Relationship",
-                                command=lambda: self.change_to_menu(self.relationship_menu))
-        menu_choice.add_command(label="Games Insights Dashboard",
-                                command=lambda: self.change_to_menu(self.dashboard_menu))
+        for attribute, label in self.menu_labels.items():
+            menu_choice.add_command(label=label, state=tk.DISABLED,
+                                    command=lambda attribute=attribute: self.change_to_menu(self.get_menu(attribute)))
         menu_choice.add_separator()
         menu_choice.add_command(label="Quit", command=self.quit)
+        self.menu_choice = menu_choice
         menubar.config(menu=menu_choice)
         menu_frame.pack(fill=tk.X)
 
@@ -68,17 +75,115 @@ class SteamLensUI(tk.Tk):
                          background="#1B2838", foreground="white")
         title.pack(fill=tk.X)
 
+        self.status_label = tk.Label(self, background="#171A21", foreground="white", font=(self.font, 12))
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
+
         self.home_menu.pack(**padding)
 
+    @property
+    def search_menu(self) -> 'SearchMenu':
+        """
+        Retrieves the search menu, creating it on first use.
+
+        :return: The search menu frame.
+        """
+        return self.get_menu("search_menu")
+
+    @property
+    def price_dist_menu(self) -> 'PriceDistMenu':
+        """
+        Retrieves the price distribution menu, creating it on first use.
+
+        :return: The price distribution menu frame.
+        """
+        return self.get_menu("price_dist_menu")
+
+    @property
+    def released_year_menu(self) -> 'ReleasedYearMenu':
+        """
+        Retrieves the released year menu, creating it on first use.
+
+        :return: The released year menu frame.
+        """
+        return self.get_menu("released_year_menu")
+
+    @property
+    def relationship_menu(self) -> 'RelationshipMenu':
+        """
+        Retrieves the relationship menu, creating it on first use.
+
+        :return: The relationship menu frame.
+        """
+        return self.get_menu("relationship_menu")
+
+    @property
+    def dashboard_menu(self) -> 'DashboardMenu':
+        """
+        Retrieves the dashboard menu, creating it on first use.
+
+        :return: The dashboard menu frame.
+        """
+        return self.get_menu("dashboard_menu")
+
+    def get_menu(self, attribute: str) -> Optional[tk.Frame]:
+        """
+        Retrieves a menu, importing its module, creating it and rendering its graphs on first use.
+
+        :param attribute: Name of the menu, which is also the name of its module.
+        :return: The menu frame, or None if the data needed by the menu is not loaded yet.
+        """
+        if not self.is_menu_ready(attribute):
+            return None
+        if attribute not in self.menus:
+            class_name, _ = self.menu_factories[attribute]
+            menu_class = getattr(importlib.import_module(attribute), class_name)
+            self.menus[attribute] = menu_class(self, self.font)
+        return self.menus[attribute]
+
+    def is_menu_ready(self, attribute: str) -> bool:
+        """
+        Checks whether the data needed by a menu is loaded.
+
+        :param attribute: Name of the menu.
+        :return: True if the menu can be opened, False if it is still waiting for its data.
+        """
+        return attribute not in self.pending_menus
+
+    def check_loading(self) -> None:
+        """
+        Shows the loading progress and enables the menus whose data is ready.
+        """
+        if self.data_loader.error is not None:
+            self.status_label.config(text=f"Could not load the data: {self.data_loader.error}")
+            return
+
+        for attribute in list(self.pending_menus):
+            if self.data_loader.is_ready(self.menu_factories[attribute][1]):
+                self.pending_menus.remove(attribute)
+                self.menu_choice.entryconfig(self.menu_labels[attribute], state=tk.NORMAL)
+                for menu in self.menus.values():
+                    if hasattr(menu, "enable_menu"):
+                        menu.enable_menu(attribute)
+                if attribute == self.prefetch_menu:
+                    self.after_idle(self.get_menu, attribute)
+
+        if not self.pending_menus:
+            self.status_label.pack_forget()
+            return
+        self.status_label.config(text=f"{self.data_loader.phase}... {self.data_loader.rows_parsed:,} rows")
+        self.after(100, self.check_loading)
+
     def change_to_menu(self, new_menu) -> None:
         """
         Changes the current menu displayed on the UI.
 
-        :param new_menu: The menu to be displayed.
+        :param new_menu: The menu to be displayed, or None to keep the current menu.
         """
+        if new_menu is None:
+            return
         padding = {'padx': 20, 'pady': 20}
 
-        for menu in self.menus:
+        for menu in self.menus.values():
             if menu != new_menu:
                 menu.pack_forget()
 
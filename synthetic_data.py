@@ -0,0 +1,173 @@
+import argparse
+import numpy as np
+import pandas as pd
+
+
+class SyntheticGames:
+    """
+    A seeded generator of synthetic game data with the columns and value formats of ``games.csv``.
+
+    Rows are generated in chunks, each from its own random stream derived from the seed, so a file of any size is
+    written in bounded memory and the same seed always gives the same file. Multi-valued columns draw their token
+    lists from a fixed pool of combinations with skewed frequencies, like the repeated combinations of the real data.
+    """
+
+    COLUMNS = ["AppID", "Name", "Release date", "Estimated owners", "Peak CCU", "Required age", "Price", "DLC count",
+               "About the game", "Supported languages", "Full audio languages", "Reviews", "Header image", "Website",
+               "Support url", "Support email", "Windows", "Mac", "Linux", "Metacritic score", "Metacritic url",
+               "User score", "Positive", "Negative", "Score rank", "Achievements", "Recommendations", "Notes",
+               "Average playtime forever", "Average playtime two weeks", "Median playtime forever",
+               "Median playtime two weeks", "Developers", "Publishers", "Categories", "Genres", "Tags", "Screenshots",
+               "Movies"]
+    CHUNK_SIZE = 100_000
+    COMBINATIONS = 4096
+    WORDS = ["Dark", "Quest", "Space", "Legend", "Hero", "Tower", "Zombie", "Farm", "Racer", "Puzzle", "Dungeon",
+             "Kingdom", "Star", "Shadow", "Island", "City", "Night", "Dragon", "Pixel", "Ghost", "Café", "Ölfarbe"]
+    MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    OWNERS = ["0 - 20000", "20000 - 50000", "50000 - 100000", "100000 - 200000", "200000 - 500000",
+              "500000 - 1000000", "1000000 - 2000000"]
+    LANGUAGES = ["['English']", "['English', 'French', 'German']", "['English', 'Simplified Chinese']",
+                 "['English', 'Japanese', 'Korean']", "[]"]
+    CATEGORIES = ["Single-player", "Multi-player", "Steam Achievements", "Full controller support", "Steam Cloud",
+                  "Co-op", "PvP", "Online PvP", "Steam Trading Cards", "Family Sharing", "Steam Leaderboards",
+                  "Remote Play Together", "In-App Purchases", "VR Support"]
+    GENRES = ["Indie", "Casual", "Action", "Adventure", "Simulation", "Strategy", "RPG", "Early Access",
+              "Free to Play", "Sports", "Racing", "Massively Multiplayer", "Education", "Utilities"]
+    TAGS = ["Indie", "Singleplayer", "Action", "Casual", "Adventure", "2D", "Strategy", "Simulation", "RPG",
+            "Puzzle", "Atmospheric", "Pixel Graphics", "3D", "Colorful", "Exploration", "Story Rich", "Cute",
+            "First-Person", "Arcade", "Fantasy", "Horror", "Shooter", "Open World", "Survival", "Sandbox",
+            "Platformer", "Roguelike", "Sci-fi", "Retro", "Multiplayer"]
+
+    def __init__(self, rows: int, seed: int = 0) -> None:
+        """
+        Initializes the SyntheticGames instance.
+
+        :param rows: Number of games to generate.
+        :param seed: Seed of the random streams.
+        """
+        self.rows = rows
+        self.seed = seed
+        rng = np.random.default_rng([seed, 0])
+        self.categories = self.combinations(rng, self.CATEGORIES, 1, 6)
+        self.genres = self.combinations(rng, self.GENRES, 1, 3)
+        self.tags = self.combinations(rng, self.TAGS, 1, 12)
+
+    @classmethod
+    def combinations(cls, rng: np.random.Generator, pool: list[str], low: int, high: int) -> np.ndarray:
+        """
+        Draws a pool of comma-separated token combinations, favouring the first tokens of the pool.
+
+        :param rng: The random generator.
+        :param pool: Tokens in decreasing order of frequency.
+        :param low: Minimum number of tokens of a combination.
+        :param high: Maximum number of tokens of a combination.
+        :return: Object array of COMBINATIONS combinations.
+        """
+        weights = 1 / np.arange(1, len(pool) + 1)
+        weights /= weights.sum()
+        return np.array([",".join(rng.choice(pool, size, replace=False, p=weights))
+                         for size in rng.integers(low, high + 1, cls.COMBINATIONS)], dtype=object)
+
+    @staticmethod
+    def pick(rng: np.random.Generator, values: np.ndarray, size: int, missing: float = 0.0) -> np.ndarray:
+        """
+        Draws values with a skewed frequency, the first values being the most frequent.
+
+        :param rng: The random generator.
+        :param values: Values to draw from.
+        :param size: Number of values to draw.
+        :param missing: Fraction of values replaced by None.
+        :return: Object array of the drawn values.
+        """
+        drawn = values[np.minimum(rng.zipf(1.3, size) - 1, len(values) - 1)].astype(object)
+        drawn[rng.random(size) < missing] = None
+        return drawn
+
+    def chunk(self, number: int) -> pd.DataFrame:
+        """
+        Generates one chunk of games.
+
+        :param number: Number of the chunk, starting at 0.
+        :return: DataFrame with the columns of ``games.csv``.
+        """
+        start = number * self.CHUNK_SIZE
+        size = min(self.CHUNK_SIZE, self.rows - start)
+        rng = np.random.default_rng([self.seed, number + 1])
+        ids = np.arange(start, start + size)
+        words = np.array(self.WORDS, dtype=object)
+        years = rng.integers(1997, 2025, size)
+        months = np.array(self.MONTHS, dtype=object)[rng.integers(0, 12, size)]
+        days = rng.integers(1, 29, size)
+        studios = np.array([f"Studio {number}" for number in range(max(size // 3, 1))], dtype=object)
+        publishers = np.array([f"Publisher {number}" for number in range(max(size // 6, 1))], dtype=object)
+        price = rng.choice([0, 0.99, 1.99, 4.99, 9.99, 14.99, 19.99, 29.99, 59.99], size,
+                           p=[.2, .15, .1, .2, .15, .08, .06, .04, .02])
+        reviewed = rng.random(size)
+        positive = (rng.pareto(1.2, size) * 20).astype(np.int64)
+        columns = {
+            "AppID": 10 + ids * 10 + rng.integers(0, 10, size),
+            "Name": words[rng.integers(0, len(words), size)] + " " + words[rng.integers(0, len(words), size)]
+            + " " + ids.astype(str).astype(object),
+            "Release date": np.where(rng.random(size) < .05, months + " " + years.astype(str).astype(object),
+                                     months + " " + days.astype(str).astype(object) + ", "
+                                     + years.astype(str).astype(object)),
+            "Estimated owners": self.pick(rng, np.array(self.OWNERS), size),
+            "Peak CCU": (rng.pareto(1.5, size) * 5).astype(np.int64),
+            "Required age": rng.choice([0, 0, 0, 0, 13, 17, 18], size),
+            "Price": price,
+            "DLC count": (rng.pareto(2.0, size)).astype(np.int64),
+            "About the game": np.where(rng.random(size) < .03, None, "A game about " + words[rng.integers(
+                0, len(words), size)] + "."),
+            "Supported languages": self.pick(rng, np.array(self.LANGUAGES), size),
+            "Full audio languages": self.pick(rng, np.array(self.LANGUAGES[::-1]), size),
+            "Reviews": np.where(reviewed < .9, None, "Great game."),
+            "Header image": "https://cdn.example.com/apps/" + ids.astype(str).astype(object) + "/header.jpg",
+            "Website": np.where(rng.random(size) < .5, None, "https://example.com"),
+            "Support url": np.where(rng.random(size) < .5, None, "https://example.com/support"),
+            "Support email": np.where(rng.random(size) < .3, None, "support@example.com"),
+            "Windows": rng.random(size) < .99,
+            "Mac": rng.random(size) < .2,
+            "Linux": rng.random(size) < .15,
+            "Metacritic score": np.where(reviewed < .95, 0, rng.integers(20, 100, size)),
+            "Metacritic url": None,
+            "User score": np.where(reviewed < .99, 0, rng.integers(20, 100, size)),
+            "Positive": positive,
+            "Negative": (positive * rng.random(size) * .5).astype(np.int64),
+            "Score rank": None,
+            "Achievements": np.where(rng.random(size) < .5, 0, rng.integers(1, 100, size)),
+            "Recommendations": np.where(positive > 100, positive // 2, 0),
+            "Notes": np.where(rng.random(size) < .95, None, "Contains violence."),
+            "Average playtime forever": np.where(reviewed < .8, 0, rng.integers(1, 2000, size)),
+            "Average playtime two weeks": np.where(reviewed < .95, 0, rng.integers(1, 500, size)),
+            "Median playtime forever": np.where(reviewed < .8, 0, rng.integers(1, 2000, size)),
+            "Median playtime two weeks": np.where(reviewed < .95, 0, rng.integers(1, 500, size)),
+            "Developers": self.pick(rng, studios, size, missing=.005),
+            "Publishers": self.pick(rng, publishers, size, missing=.02),
+            "Categories": self.pick(rng, self.categories, size, missing=.02),
+            "Genres": self.pick(rng, self.genres, size, missing=.01),
+            "Tags": self.pick(rng, self.tags, size, missing=.05),
+            "Screenshots": "https://cdn.example.com/apps/" + ids.astype(str).astype(object) + "/1.jpg",
+            "Movies": np.where(rng.random(size) < .6, None, "https://cdn.example.com/movie.mp4"),
+        }
+        return pd.DataFrame(columns, columns=self.COLUMNS)
+
+    def write(self, path: str) -> None:
+        """
+        Writes the games to a CSV file, one chunk at a time.
+
+        :param path: Path of the CSV file.
+        """
+        for number in range((self.rows + self.CHUNK_SIZE - 1) // self.CHUNK_SIZE):
+            self.chunk(number).to_csv(path, mode="w" if number == 0 else "a", header=number == 0, index=False)
+        if self.rows == 0:
+            pd.DataFrame(columns=self.COLUMNS).to_csv(path, index=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Write a synthetic games.csv for testing and benchmarks.")
+    parser.add_argument("--rows", type=int, default=100_000, help="number of games (default: 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--output", default="synthetic_games.csv",
+                        help="path of the CSV file (default: synthetic_games.csv)")
+    arguments = parser.parse_args()
+    SyntheticGames(arguments.rows, arguments.seed).write(arguments.output)
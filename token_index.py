@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+
+class TokenIndex:
+    """
+    An inverted index from the comma-separated tokens of a column to the rows containing them.
+
+    The tokens of each row are kept as a compressed row list (``row_offsets``/``row_tokens``) and every
+    token has a sorted int32 posting list of row positions.
+    """
+
+    SEPARATOR = ","
+
+    def __init__(self, vocabulary: list[str], row_offsets: np.ndarray, row_tokens: np.ndarray) -> None:
+        """
+        Initializes the TokenIndex instance.
+
+        :param vocabulary: Token strings, indexed by token id.
+        :param row_offsets: Array of length rows + 1, row i owns row_tokens[row_offsets[i]:row_offsets[i + 1]].
+        :param row_tokens: Token ids of every row, concatenated.
+        """
+        self.vocabulary = vocabulary
+        self.token_ids = {token: token_id for token_id, token in enumerate(vocabulary)}
+        self.row_offsets = row_offsets
+        self.row_tokens = row_tokens
+        token_rows = np.repeat(np.arange(len(row_offsets) - 1, dtype=np.int32), np.diff(row_offsets))
+        # numpy sorts 16-bit keys with a radix sort, which is several times faster than sorting int32 tokens.
+        sort_keys = row_tokens.astype(np.uint16) if len(vocabulary) <= 1 << 16 else row_tokens
+        order = np.argsort(sort_keys, kind="stable")
+        self.postings = token_rows[order]
+        self.counts = np.bincount(row_tokens, minlength=len(vocabulary))
+        self.posting_offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(self.counts, out=self.posting_offsets[1:])
+
+    @classmethod
+    def from_series(cls, column: pd.Series) -> 'TokenIndex':
+        """
+        Builds an index over a column of comma-separated tokens.
+
+        Each distinct cell value is split once, so repeated values and categorical columns are cheap to index.
+        Duplicate tokens within a cell are indexed once and missing values have no tokens.
+
+        :param column: The column to index.
+        :return: TokenIndex over the column.
+        """
+        codes, uniques = pd.factorize(column)
+        token_ids = {}
+        unique_tokens = [[token_ids.setdefault(token, len(token_ids))
+                          for token in dict.fromkeys(value.split(cls.SEPARATOR))] for value in uniques]
+        # The extra zero length is picked up by code -1, which factorize uses for missing values.
+        unique_lengths = np.array([len(tokens) for tokens in unique_tokens] + [0], dtype=np.int64)
+        unique_offsets = np.zeros(len(unique_lengths), dtype=np.int64)
+        np.cumsum(unique_lengths[:-1], out=unique_offsets[1:])
+        flat_tokens = np.fromiter((token for tokens in unique_tokens for token in tokens), dtype=np.int32,
+                                  count=int(unique_lengths.sum()))
+
+        lengths = unique_lengths[codes]
+        row_offsets = np.zeros(len(codes) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=row_offsets[1:])
+        starts = np.repeat(unique_offsets[codes] - row_offsets[:-1], lengths)
+        row_tokens = flat_tokens[starts + np.arange(row_offsets[-1])]
+        return cls(list(token_ids), row_offsets, row_tokens)
+
+    @classmethod
+    def concatenate(cls, indexes: list['TokenIndex']) -> 'TokenIndex':
+        """
+        Joins the indexes of consecutive blocks of rows into one index.
+
+        :param indexes: Indexes of consecutive blocks of rows, in row order.
+        :return: TokenIndex over all the rows.
+        """
+        return cls(*cls.join_blocks([(index.vocabulary, index.row_offsets, index.row_tokens) for index in indexes]))
+
+    @staticmethod
+    def join_blocks(blocks: list[tuple[list[str], np.ndarray, np.ndarray]]) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """
+        Joins the tokens of consecutive blocks of rows.
+
+        The token ids of the first block are kept and the new tokens of the following blocks are appended to its
+        vocabulary, so joining the blocks of consecutive chunks gives the same result as indexing the whole column
+        at once.
+
+        :param blocks: Tuples of the vocabulary, row offsets and row tokens of every block, in row order.
+        :return: Tuple of the vocabulary, row offsets and row tokens of all the rows.
+        """
+        token_ids = {}
+        row_offsets = [np.zeros(1, dtype=np.int64)]
+        row_tokens = [np.zeros(0, dtype=np.int32)]
+        # Blocks without rows add no offsets, so the running total is kept apart from the last offsets appended.
+        total = 0
+        for vocabulary, block_offsets, block_tokens in blocks:
+            mapping = np.array([token_ids.setdefault(token, len(token_ids)) for token in vocabulary], dtype=np.int32)
+            row_offsets.append(block_offsets[1:] + total)
+            row_tokens.append(mapping[block_tokens])
+            total += int(block_offsets[-1])
+        return list(token_ids), np.concatenate(row_offsets), np.concatenate(row_tokens)
+
+    def updated(self, rows: np.ndarray, column: pd.Series) -> 'TokenIndex':
+        """
+        Builds the index of a selection of the rows followed by new rows, keeping the vocabulary and its token ids.
+
+        :param rows: Array of the row positions kept, in order.
+        :param column: The comma-separated tokens of the new rows.
+        :return: TokenIndex over the kept rows and the new rows, tokens no row uses any more have a count of zero.
+        """
+        row_tokens, owners = self.row_tokens_of(rows)
+        row_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners, minlength=len(rows)), out=row_offsets[1:])
+        added = TokenIndex.from_series(column)
+        return TokenIndex(*self.join_blocks([(self.vocabulary, row_offsets, row_tokens),
+                                             (added.vocabulary, added.row_offsets, added.row_tokens)]))
+
+    def used_tokens(self) -> list[str]:
+        """
+        Retrieves the tokens of the vocabulary that at least one row contains.
+
+        :return: List of tokens in order of token id.
+        """
+        return [token for token, count in zip(self.vocabulary, self.counts.tolist()) if count]
+
+    def rows(self, token: str) -> np.ndarray:
+        """
+        Retrieves the rows containing a token.
+
+        :param token: The token to look up.
+        :return: Sorted int32 array of row positions, empty if the token is unknown.
+        """
+        token_id = self.token_ids.get(token)
+        if token_id is None:
+            return self.postings[:0]
+        return self.postings[self.posting_offsets[token_id]:self.posting_offsets[token_id + 1]]
+
+    def row_tokens_of(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Retrieves the tokens of a selection of rows.
+
+        :param rows: Array of row positions.
+        :return: Tuple of the token ids of the rows, concatenated, and for each token the index in ``rows`` of the
+                 row it belongs to.
+        """
+        lengths = self.row_offsets[rows + 1] - self.row_offsets[rows]
+        ends = np.cumsum(lengths)
+        starts = np.repeat(self.row_offsets[rows] - ends + lengths, lengths)
+        positions = starts + np.arange(ends[-1] if len(ends) else 0)
+        return self.row_tokens[positions], np.repeat(np.arange(len(rows)), lengths)
@@ -0,0 +1,167 @@
+import copy
+import numpy as np
+import pandas as pd
+
+
+class TrigramIndex:
+    """
+    A trigram index over the upper-cased distinct values of a text column, used for substring search.
+
+    A search looks up the trigrams of the pattern to find candidate values, checks the pattern against those
+    values only and returns the rows holding a match. Matching is the same as
+    ``Series.str.contains(pattern, case=False, regex=False)``, which compares upper-cased text.
+    """
+
+    def __init__(self, column: pd.Series) -> None:
+        """
+        Initializes the TrigramIndex instance.
+
+        :param column: The text column to index.
+        """
+        codes, uniques = pd.factorize(column)
+        self.values = np.array([str(value).upper() for value in uniques], dtype=object)
+        self.index_rows(codes)
+        keys, value_ids = self.trigrams(self.values)
+        order = np.argsort(keys, kind="stable")
+        self.index_trigrams(keys[order], value_ids[order])
+
+    def index_rows(self, codes: np.ndarray) -> None:
+        """
+        Groups the rows by value.
+
+        :param codes: Value id of every row, -1 for missing values.
+        """
+        self.size = len(codes)
+        rows = np.argsort(codes, kind="stable").astype(np.int32)
+        counts = np.bincount(codes + 1, minlength=len(self.values) + 1)
+        self.value_rows = rows[counts[0]:]
+        self.value_offsets = np.zeros(len(self.values) + 1, dtype=np.int64)
+        np.cumsum(counts[1:], out=self.value_offsets[1:])
+
+    def index_trigrams(self, keys: np.ndarray, value_ids: np.ndarray) -> None:
+        """
+        Groups the values by trigram.
+
+        :param keys: Trigram keys, sorted.
+        :param value_ids: Id of the value of every key, ascending among equal keys.
+        """
+        distinct = np.ones(len(keys), dtype=bool)
+        distinct[1:] = (keys[1:] != keys[:-1]) | (value_ids[1:] != value_ids[:-1])
+        keys, self.key_values = keys[distinct], value_ids[distinct]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        self.keys = keys[first]
+        self.key_offsets = np.append(np.flatnonzero(first), len(keys)).astype(np.int64)
+
+    def row_codes(self) -> np.ndarray:
+        """
+        Retrieves the value id of every row.
+
+        :return: Array of value ids, -1 for missing values.
+        """
+        codes = np.full(self.size, -1, dtype=np.int64)
+        codes[self.value_rows] = np.repeat(np.arange(len(self.values)), np.diff(self.value_offsets))
+        return codes
+
+    def updated(self, rows: np.ndarray, column: pd.Series) -> 'TrigramIndex':
+        """
+        Builds the index of a selection of the rows followed by new rows, without indexing the known values again.
+
+        Only the trigrams of values not seen before are extracted and merged into the sorted trigram lists.
+
+        :param rows: Array of the row positions kept, in order.
+        :param column: The text of the new rows.
+        :return: TrigramIndex over the kept rows and the new rows.
+        """
+        codes, uniques = pd.factorize(column)
+        upper_codes, upper_values = pd.factorize(np.array([str(value).upper() for value in uniques], dtype=object))
+        # Only the few new values are hashed, the known values are probed against them.
+        matches = pd.Index(upper_values).get_indexer(self.values)
+        value_ids = np.full(len(upper_values), -1, dtype=np.int64)
+        found = np.flatnonzero(matches >= 0)
+        matched, first = np.unique(matches[found], return_index=True)
+        value_ids[matched] = found[first]
+        unseen = value_ids < 0
+        value_ids[unseen] = len(self.values) + np.arange(np.count_nonzero(unseen))
+        # The extra -1 is picked up by code -1, which factorize uses for missing values.
+        mapping = np.append(value_ids[upper_codes], -1)
+        new_values = upper_values[unseen]
+
+        index = copy.copy(self)
+        index.values = np.concatenate([self.values, new_values])
+        index.index_rows(np.concatenate([self.row_codes()[rows], mapping[codes]]))
+        keys, new_value_ids = self.trigrams(new_values)
+        order = np.argsort(keys, kind="stable")
+        keys, new_value_ids = keys[order], new_value_ids[order] + len(self.values)
+        all_keys = np.repeat(self.keys, np.diff(self.key_offsets))
+        positions = np.searchsorted(all_keys, keys, side="right")
+        index.index_trigrams(np.insert(all_keys, positions, keys), np.insert(self.key_values, positions, new_value_ids))
+        return index
+
+    @staticmethod
+    def trigrams(values) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Extracts every trigram of a sequence of strings.
+
+        Each trigram is packed into a uint64 key of three 21-bit code points.
+
+        :param values: The strings to split into trigrams.
+        :return: Tuple of the trigram keys and the position of the string each key comes from.
+        """
+        lengths = np.fromiter((len(value) for value in values), dtype=np.int64, count=len(values))
+        code_points = np.frombuffer("".join(values).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        starts = np.cumsum(lengths) - lengths
+        value_ids = np.repeat(np.arange(len(values), dtype=np.int32), lengths)
+        positions = np.flatnonzero(np.arange(len(code_points)) - starts[value_ids] + 2 < lengths[value_ids])
+        code_points = code_points.astype(np.uint64)
+        keys = code_points[positions] << 42 | code_points[positions + 1] << 21 | code_points[positions + 2]
+        return keys, value_ids[positions]
+
+    @staticmethod
+    def gather(offsets: np.ndarray, values: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """
+        Concatenates the segments ``values[offsets[i]:offsets[i + 1]]`` of the given ids.
+
+        :param offsets: Segment boundaries.
+        :param values: Concatenated segments.
+        :param ids: Ids of the segments to gather.
+        :return: The gathered values.
+        """
+        lengths = offsets[ids + 1] - offsets[ids]
+        ends = np.cumsum(lengths)
+        return values[np.repeat(offsets[ids] - ends + lengths, lengths) + np.arange(ends[-1] if len(ends) else 0)]
+
+    def candidate_values(self, pattern: str) -> np.ndarray:
+        """
+        Finds the distinct values containing every trigram of an upper-cased pattern.
+
+        :param pattern: The upper-cased search pattern, at least three characters long.
+        :return: Sorted array of value ids.
+        """
+        keys, _ = self.trigrams([pattern])
+        keys = np.unique(keys)
+        positions = np.searchsorted(self.keys, keys)
+        if (positions >= len(self.keys)).any() or (self.keys[np.minimum(positions, len(self.keys) - 1)] != keys).any():
+            return self.key_values[:0]
+        postings = sorted((self.key_values[self.key_offsets[position]:self.key_offsets[position + 1]]
+                           for position in positions), key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        return candidates
+
+    def search(self, pattern: str) -> np.ndarray:
+        """
+        Finds the rows whose value contains a pattern, ignoring case.
+
+        :param pattern: The text to search for.
+        :return: Sorted int32 array of row positions.
+        """
+        pattern = pattern.upper()
+        if len(pattern) >= 3:
+            candidates = self.candidate_values(pattern)
+        else:
+            candidates = np.arange(len(self.values))
+        matches = np.array([value_id for value_id in candidates.tolist() if pattern in self.values[value_id]],
+                           dtype=np.int64)
+        return np.sort(self.gather(self.value_offsets, self.value_rows, matches))
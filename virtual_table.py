@@ -0,0 +1,196 @@
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+
+
+class VirtualTable(tk.Frame):
+    """
+    A table widget showing a scrollable window over an array of row ids.
+
+    Only the visible rows are materialised: the Treeview holds one item per visible line and the values of those
+    items are replaced as the window moves. All widget updates run on the Tk thread in ``after`` batches.
+    """
+
+    BATCH_SIZE = 25
+
+    def __init__(self, parent, columns: list[str], row_values, height: int = 5, **kwargs) -> None:
+        """
+        Initializes the VirtualTable widget.
+
+        :param parent: The parent widget.
+        :param columns: Names of the table columns.
+        :param row_values: Function returning the list of column values of every row id in an array.
+        :param height: Number of visible rows.
+        """
+        super().__init__(parent, **kwargs)
+        self.row_values = row_values
+        self.height = height
+        self.rows = np.empty(0, dtype=np.int64)
+        self.shown_rows = self.rows
+        self.offset = 0
+        self.selected_row = None
+        self.render_job = None
+        self.render_generation = 0
+
+        self.x_scrollbar = ttk.Scrollbar(self, orient="horizontal")
+        self.x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.y_scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree = ttk.Treeview(self, columns=columns, selectmode="browse", show="headings", height=height)
+        for column in columns:
+            self.tree.column(column, width=80)
+            self.tree.heading(column, text=column)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.config(xscrollcommand=self.x_scrollbar.set)
+        self.x_scrollbar.config(command=self.tree.xview)
+
+        self.tree.bind("<<TreeviewSelect>>", self.remember_selection)
+        self.tree.bind("<MouseWheel>", self.mouse_wheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_to(self.offset - 1))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_to(self.offset + 1))
+        self.tree.bind("<Up>", lambda event: self.move_focus(-1))
+        self.tree.bind("<Down>", lambda event: self.move_focus(1))
+        self.update_scrollbar()
+
+    def set_rows(self, rows: np.ndarray) -> None:
+        """
+        Replaces the rows shown by the table and scrolls back to the top.
+
+        :param rows: Array of row ids in display order.
+        """
+        self.rows = rows
+        self.offset = 0
+        self.selected_row = None
+        self.update_scrollbar()
+        self.schedule_render()
+
+    def focused_row(self):
+        """
+        Retrieves the row id of the focused line.
+
+        :return: The row id, or None if no visible line has the focus.
+        """
+        focus = self.tree.focus()
+        if not focus or int(focus) >= len(self.shown_rows):
+            return None
+        return self.shown_rows[int(focus)]
+
+    def focused_values(self) -> list:
+        """
+        Retrieves the values shown on the focused line.
+
+        :return: List of the displayed values, empty if no line has the focus.
+        """
+        focus = self.tree.focus()
+        return self.tree.item(focus)['values'] if focus else []
+
+    def remember_selection(self, *args) -> None:
+        """
+        Keeps track of the selected row id so the selection follows the row while scrolling.
+        """
+        selection = self.tree.selection()
+        if selection and int(selection[0]) < len(self.shown_rows):
+            self.selected_row = self.shown_rows[int(selection[0])]
+
+    def mouse_wheel(self, event) -> str:
+        """
+        Scrolls the visible window with the mouse wheel.
+
+        :param event: The mouse wheel event.
+        :return: "break" to stop the default Treeview scrolling.
+        """
+        steps = max(abs(event.delta) // 120, 1)
+        self.scroll_to(self.offset - steps if event.delta > 0 else self.offset + steps)
+        return "break"
+
+    def move_focus(self, step: int) -> str:
+        """
+        Moves the focus one line up or down, scrolling when it leaves the visible window.
+
+        :param step: -1 to move up, 1 to move down.
+        :return: "break" to stop the default Treeview key handling.
+        """
+        focus = self.tree.focus()
+        line = int(focus) + step if focus else 0
+        if line < 0 or line >= self.height:
+            self.scroll_to(self.offset + step)
+            line = min(max(line, 0), self.height - 1)
+        position = self.offset + line
+        if position < len(self.rows):
+            self.selected_row = self.rows[position]
+            self.schedule_render()
+        return "break"
+
+    def yview(self, *args) -> None:
+        """
+        Handles the commands of the vertical scrollbar.
+        """
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.rows)))
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def scroll_to(self, offset: int) -> None:
+        """
+        Moves the visible window so that it starts at the given position.
+
+        :param offset: Position of the first visible row.
+        """
+        offset = min(max(offset, 0), max(len(self.rows) - self.height, 0))
+        if offset != self.offset:
+            self.offset = offset
+            self.update_scrollbar()
+            self.schedule_render()
+
+    def update_scrollbar(self) -> None:
+        """
+        Updates the vertical scrollbar to the visible window.
+        """
+        if len(self.rows):
+            self.y_scrollbar.set(self.offset / len(self.rows), min((self.offset + self.height) / len(self.rows), 1))
+        else:
+            self.y_scrollbar.set(0, 1)
+
+    def schedule_render(self) -> None:
+        """
+        Schedules a redraw of the visible window, merging requests made before it runs.
+        """
+        if self.render_job is None:
+            self.render_job = self.after_idle(self.render)
+
+    def render(self) -> None:
+        """
+        Fetches the values of the visible rows and starts filling the table lines in batches.
+        """
+        self.render_job = None
+        self.render_generation += 1
+        self.shown_rows = self.rows[self.offset:self.offset + self.height]
+        lines = self.tree.get_children()
+        if len(lines) > len(self.shown_rows):
+            self.tree.delete(*lines[len(self.shown_rows):])
+        self.tree.selection_remove(*self.tree.selection())
+        values = self.row_values(self.shown_rows) if len(self.shown_rows) else []
+        self.render_batch(self.render_generation, values, 0)
+
+    def render_batch(self, generation: int, values: list, start: int) -> None:
+        """
+        Fills one batch of table lines and schedules the next one.
+
+        :param generation: Render generation of the batch, stale batches are dropped.
+        :param values: Values of the visible rows.
+        :param start: Index of the first line of the batch.
+        """
+        if generation != self.render_generation:
+            return
+        for line in range(start, min(start + self.BATCH_SIZE, len(values))):
+            if self.tree.exists(str(line)):
+                self.tree.item(str(line), values=values[line])
+            else:
+                self.tree.insert('', 'end', iid=str(line), values=values[line])
+            if self.shown_rows[line] == self.selected_row:
+                self.tree.selection_set(str(line))
+                self.tree.focus(str(line))
+        if start + self.BATCH_SIZE < len(values):
+            self.after(1, lambda: self.render_batch(generation, values, start + self.BATCH_SIZE))